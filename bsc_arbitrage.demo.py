@@ -3,6 +3,11 @@ BSC Arbitrage Bot - Web3 Real-time Version
 Fetches prices directly from DEX smart contracts for instant updates
 WITH PostgreSQL DATABASE LOGGING
 """
+import asyncio
+import json
+import queue
+import sys
+import threading
 import time
 from datetime import datetime
 from typing import Optional, Tuple, Dict
@@ -10,12 +15,49 @@ from decimal import Decimal
 import os
 
 try:
-    from web3 import Web3
+    import aiohttp
+    from web3 import Web3, AsyncWeb3, AsyncHTTPProvider
     WEB3_AVAILABLE = True
 except ImportError:
     WEB3_AVAILABLE = False
     print("⚠️  Web3.py not installed. Install with: pip install web3 --break-system-packages")
 
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import websockets
+    WEBSOCKETS_AVAILABLE = True
+except ImportError:
+    WEBSOCKETS_AVAILABLE = False
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = NUMPY_AVAILABLE
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 try:
     from database import ArbitrageDatabase
     DATABASE_AVAILABLE = True
@@ -33,6 +75,12 @@ BSC_RPC_ENDPOINTS = [
     "https://bsc-dataseed2.defibit.io"
 ]
 
+# WebSocket endpoint for newHeads subscriptions (scan per block, not per timer)
+BSC_WS_ENDPOINT = "wss://bsc-ws-node.nariox.org:443"
+
+# How long a failing RPC endpoint sits out before being retried
+RPC_COLD_SECONDS = 30.0
+
 # === TOKEN & PAIR ADDRESSES ===
 WBNB_ADDRESS = "0xbb4CdB9CBd36B01bD1cBaEBF2De08d9173bc095c"
 BUSD_ADDRESS = "0xe9e7CEA3DedcA5984780Bafc599bD69ADd087D56"
@@ -45,16 +93,51 @@ PANCAKE_FACTORY = "0xcA143Ce32Fe78f1f7019d7d551a6402fC5350c73"
 BISWAP_ROUTER = "0x3a6d8cA21D1CF76F653A67577FA0D27453350dD8"
 BISWAP_FACTORY = "0x858E3312ed3A876947EA49d572A7C42DE08af7EE"
 
-# === ROUTER ABI (minimal for getAmountsOut) ===
-ROUTER_ABI = [
+# === QUOTE CALLDATA (specialized at module load) ===
+# getAmountsOut(uint256,address[]) with amountIn = 1 WBNB and the fixed
+# [WBNB, BUSD] path is byte-identical on every tick, so the complete
+# calldata is assembled once here: 4-byte selector + amountIn + array
+# offset + path length + the two zero-padded addresses
+_GET_AMOUNTS_OUT_SELECTOR = "d06ca61f"
+
+QUOTE_CALLDATA = bytes.fromhex(
+    _GET_AMOUNTS_OUT_SELECTOR
+    + f"{10**18:064x}"                          # amountIn (1 WBNB)
+    + f"{0x40:064x}"                            # offset of address[] data
+    + f"{2:064x}"                               # path length
+    + WBNB_ADDRESS[2:].lower().rjust(64, "0")   # path[0]
+    + BUSD_ADDRESS[2:].lower().rjust(64, "0")   # path[1]
+)
+QUOTE_CALLDATA_HEX = "0x" + QUOTE_CALLDATA.hex()
+
+# === MULTICALL3 (same address on all EVM chains) ===
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+
+MULTICALL3_ABI = [
     {
-        "constant": True,
         "inputs": [
-            {"name": "amountIn", "type": "uint256"},
-            {"name": "path", "type": "address[]"}
+            {
+                "components": [
+                    {"name": "target", "type": "address"},
+                    {"name": "allowFailure", "type": "bool"},
+                    {"name": "callData", "type": "bytes"}
+                ],
+                "name": "calls",
+                "type": "tuple[]"
+            }
+        ],
+        "name": "aggregate3",
+        "outputs": [
+            {
+                "components": [
+                    {"name": "success", "type": "bool"},
+                    {"name": "returnData", "type": "bytes"}
+                ],
+                "name": "returnData",
+                "type": "tuple[]"
+            }
         ],
-        "name": "getAmountsOut",
-        "outputs": [{"name": "amounts", "type": "uint256[]"}],
+        "stateMutability": "payable",
         "type": "function"
     }
 ]
@@ -68,6 +151,14 @@ MIN_PROFIT_THRESHOLD = 0.01  # Minimum $0.01 net profit (changed from spread %)
 PANCAKESWAP_FEE = 0.0025
 BISWAP_FEE = 0.001
 
+# Flush buffered DB scans after this many rows or seconds, whichever first
+DB_FLUSH_SIZE = 50
+DB_FLUSH_SECONDS = 10.0
+
+# Folded once at module load - every input above is a constant
+_EFFECTIVE_CAPITAL = FLASH_LOAN_AMOUNT_USD * (1 - FLASH_LOAN_FEE)
+_GAS_ADJUST = FLASH_LOAN_AMOUNT_USD + GAS_COST_USD
+
 class Colors:
     GREEN = '\033[92m'
     RED = '\033[91m'
@@ -77,106 +168,437 @@ class Colors:
     BOLD = '\033[1m'
     END = '\033[0m'
 
+# ANSI codes only make sense on a real terminal - blank them when piped
+if not sys.stdout.isatty():
+    for _name in ("GREEN", "RED", "YELLOW", "BLUE", "CYAN", "BOLD", "END"):
+        setattr(Colors, _name, "")
+
+# Wall-clock anchor for cheap timestamps: strftime re-parses its format
+# string and hits the locale machinery on every call, so anchor the wall
+# clock once and derive tick timestamps from the monotonic clock instead
+_anchor_ms_of_day = 0
+_anchor_mono = 0.0
+
+def init_clock():
+    """Anchor the monotonic clock to wall time (call once at startup)"""
+    global _anchor_ms_of_day, _anchor_mono
+    now = datetime.now()
+    _anchor_ms_of_day = ((now.hour * 3600 + now.minute * 60 + now.second) * 1000
+                         + now.microsecond // 1000)
+    _anchor_mono = time.monotonic()
+
+def fast_timestamp() -> str:
+    """HH:MM:SS.mmm via integer arithmetic on the monotonic clock"""
+    ms_of_day = (_anchor_ms_of_day
+                 + int((time.monotonic() - _anchor_mono) * 1000)) % 86_400_000
+    secs, msec = divmod(ms_of_day, 1000)
+    mins, ss = divmod(secs, 60)
+    hh, mm = divmod(mins, 60)
+    return f"{hh:02d}:{mm:02d}:{ss:02d}.{msec:03d}"
+
 def log(message: str, color: str = ""):
-    timestamp = datetime.now().strftime("%H:%M:%S")
+    if _anchor_mono:
+        timestamp = fast_timestamp()[:8]
+    else:
+        timestamp = datetime.now().strftime("%H:%M:%S")
     print(f"{color}[{timestamp}] {message}{Colors.END}")
 
+if WEB3_AVAILABLE:
+    if ORJSON_AVAILABLE:
+        class _OrjsonCodecMixin:
+            """Encode/parse RPC payloads with orjson instead of stdlib json"""
+
+            def encode_rpc_request(self, method, params):
+                return orjson.dumps({
+                    "jsonrpc": "2.0",
+                    "method": method,
+                    "params": params or [],
+                    "id": next(self.request_counter),
+                }, default=str)
+
+            def decode_rpc_response(self, raw_response):
+                return orjson.loads(raw_response)
+    else:
+        class _OrjsonCodecMixin:
+            """No-op when orjson is absent - the stdlib codec is used"""
+            pass
+
+    class PooledAsyncHTTPProvider(_OrjsonCodecMixin, AsyncHTTPProvider):
+        """Default provider plus the fast JSON codec"""
+        pass
+
+if WEB3_AVAILABLE and HTTPX_AVAILABLE:
+    class HTTP2Provider(_OrjsonCodecMixin, AsyncHTTPProvider):
+        """AsyncHTTPProvider variant that POSTs over a shared HTTP/2 client,
+        so concurrent eth_calls multiplex frames on one TLS connection
+        instead of queueing on HTTP/1.1 streams"""
+
+        _client = None
+
+        @classmethod
+        def client(cls):
+            if cls._client is None:
+                cls._client = httpx.AsyncClient(
+                    http2=True,
+                    limits=httpx.Limits(max_keepalive_connections=16),
+                    timeout=5.0
+                )
+            return cls._client
+
+        async def make_request(self, method, params):
+            request_data = self.encode_rpc_request(method, params)
+            response = await self.client().post(
+                str(self.endpoint_uri),
+                content=request_data,
+                headers={"Content-Type": "application/json"}
+            )
+            return self.decode_rpc_response(response.content)
+
+class DatabaseWriter:
+    """Owns the scan-log queue on a daemon thread so database round-trips
+    never block the price loop"""
+
+    def __init__(self, db):
+        self.db = db
+        self.queue = queue.Queue(maxsize=1000)
+        self.thread = threading.Thread(target=self._worker, daemon=True)
+        self.thread.start()
+
+    def put_scan(self, scan):
+        """Queue one scan row; drop the oldest if the queue is full
+        (scan data is loss-tolerant, detection latency is not)"""
+        try:
+            self.queue.put_nowait(scan)
+        except queue.Full:
+            try:
+                self.queue.get_nowait()
+            except queue.Empty:
+                pass
+            self.queue.put_nowait(scan)
+
+    def _worker(self):
+        while True:
+            batch = [self.queue.get()]
+            deadline = time.monotonic() + DB_FLUSH_SECONDS
+            while len(batch) < DB_FLUSH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self.db.log_price_scans_batch(batch)
+
+    def flush(self, timeout: float = 5.0):
+        """Best-effort drain before shutdown"""
+        deadline = time.monotonic() + timeout
+        while not self.queue.empty() and time.monotonic() < deadline:
+            time.sleep(0.05)
+
 class Web3PriceFetcher:
     def __init__(self):
         self.w3 = None
-        self.pancake_router = None
-        self.biswap_router = None
+        self.multicall = None
+        self.pancake_addr = None
+        self.biswap_addr = None
+        self.session = None
+        self.last_block = 0
+        self.cached_prices = None
         self.connected = False
-        
+
+        # Hot-swap RPC pool: every live endpoint plus per-endpoint health
+        self.pool = {}           # rpc url -> AsyncWeb3
+        self.ewma_latency = {}   # rpc url -> moving-average RTT (seconds)
+        self.cold_until = {}     # rpc url -> monotonic time it may be retried
+        self.current_rpc = None
+        self.multicall_addr = None
+
+    async def _probe_endpoint(self, rpc: str) -> Tuple[float, str, "AsyncWeb3"]:
+        """Time an eth_blockNumber round-trip against one endpoint"""
+        if HTTPX_AVAILABLE:
+            provider = HTTP2Provider(rpc, request_kwargs={'timeout': 5})
+        else:
+            provider = PooledAsyncHTTPProvider(rpc, request_kwargs={'timeout': 5})
+            await provider.cache_async_session(self.session)
+        w3 = AsyncWeb3(provider)
+
+        start = time.perf_counter()
+        await w3.eth.block_number
+        return time.perf_counter() - start, rpc, w3
+
+    async def connect(self) -> bool:
+        """Probe all BSC RPC endpoints at once and keep the fastest one"""
         if not WEB3_AVAILABLE:
-            return
-        
-        # Try connecting to BSC RPC
-        for rpc in BSC_RPC_ENDPOINTS:
-            try:
-                self.w3 = Web3(Web3.HTTPProvider(rpc, request_kwargs={'timeout': 5}))
-                if self.w3.is_connected():
-                    log(f"Connected to BSC via {rpc}", Colors.GREEN)
-                    self.pancake_router = self.w3.eth.contract(
-                        address=Web3.to_checksum_address(PANCAKE_ROUTER),
-                        abi=ROUTER_ABI
-                    )
-                    self.biswap_router = self.w3.eth.contract(
-                        address=Web3.to_checksum_address(BISWAP_ROUTER),
-                        abi=ROUTER_ABI
-                    )
-                    self.connected = True
-                    break
-            except Exception as e:
-                continue
-        
-        if not self.connected:
+            return False
+
+        # One keep-alive session shared by every RPC call, so TCP+TLS
+        # handshakes are paid once instead of per eth_call (the HTTP/2
+        # provider brings its own shared client)
+        if not HTTPX_AVAILABLE:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=32, ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(total=5)
+            )
+
+        results = await asyncio.gather(
+            *(self._probe_endpoint(rpc) for rpc in BSC_RPC_ENDPOINTS),
+            return_exceptions=True
+        )
+        alive = [r for r in results if not isinstance(r, BaseException)]
+
+        if not alive:
             log("Failed to connect to any BSC RPC endpoint", Colors.RED)
-    
-    def get_price_from_router(self, router_contract, amount_in: int, path: list) -> Optional[float]:
-        """Get price from DEX router using getAmountsOut"""
+            return False
+
+        # Keep every live endpoint in the pool, seeded with its probe RTT
+        for latency, rpc, w3 in alive:
+            self.pool[rpc] = w3
+            self.ewma_latency[rpc] = latency
+            self.cold_until[rpc] = 0.0
+
+        # Checksumming is a SHA3 hash - do it once, not per tick
+        self.pancake_addr = Web3.to_checksum_address(PANCAKE_ROUTER)
+        self.biswap_addr = Web3.to_checksum_address(BISWAP_ROUTER)
+        self.multicall_addr = Web3.to_checksum_address(MULTICALL3_ADDRESS)
+
+        best_rpc = self._pick_endpoint()
+        self._use_endpoint(best_rpc)
+        log(f"Connected to BSC via {best_rpc} "
+            f"({self.ewma_latency[best_rpc] * 1000:.0f}ms, pool of {len(self.pool)})", Colors.GREEN)
+
+        self.connected = True
+        return True
+
+    def _use_endpoint(self, rpc: str):
+        """Route subsequent calls through one endpoint from the pool"""
+        self.current_rpc = rpc
+        self.w3 = self.pool[rpc]
+        self.multicall = self.w3.eth.contract(
+            address=self.multicall_addr,
+            abi=MULTICALL3_ABI
+        )
+
+    def _pick_endpoint(self) -> str:
+        """Lowest moving-average latency among endpoints not marked cold"""
+        now = time.monotonic()
+        warm = [rpc for rpc in self.pool if self.cold_until[rpc] <= now]
+        candidates = warm or list(self.pool)
+        return min(candidates, key=lambda rpc: self.ewma_latency[rpc])
+
+    def _record_latency(self, rpc: str, elapsed: float):
+        self.ewma_latency[rpc] = 0.9 * self.ewma_latency[rpc] + 0.1 * elapsed
+
+    def _mark_cold(self, rpc: str):
+        """Bench a failing endpoint and fail over to the next-best one"""
+        self.cold_until[rpc] = time.monotonic() + RPC_COLD_SECONDS
+        replacement = self._pick_endpoint()
+        if replacement != self.current_rpc:
+            log(f"RPC {rpc} failing - switching to {replacement}", Colors.YELLOW)
+            self._use_endpoint(replacement)
+
+    async def get_price_from_router(self, router_addr: str) -> Optional[float]:
+        """Get price from a DEX router via raw eth_call, skipping the
+        web3.py middleware/formatter stack entirely"""
         try:
-            amounts = router_contract.functions.getAmountsOut(
-                amount_in,
-                [Web3.to_checksum_address(addr) for addr in path]
-            ).call()
-            
-            # Calculate price: output amount / input amount
-            # amounts[0] is input, amounts[1] is output
-            price = amounts[1] / amounts[0]
-            return price
-            
+            response = await self.w3.provider.make_request(
+                "eth_call",
+                [{"to": router_addr, "data": QUOTE_CALLDATA_HEX}, "latest"]
+            )
+            raw = response.get("result")
+            if not raw or raw == "0x":
+                return None
+
+            # Return layout is fixed: offset, length, amounts[0], amounts[1].
+            # The last 32-byte word is the BUSD output for 1 WBNB (1e18 wei) in
+            return int(raw[-64:], 16) / 10**18
+
         except Exception as e:
             return None
-    
-    def get_wbnb_price_busd(self) -> Optional[Dict[str, float]]:
-        """Get WBNB price in BUSD from both DEXes"""
+
+    async def get_wbnb_price_busd(self) -> Optional[Dict[str, float]]:
+        """Get WBNB price in BUSD from both DEXes (one Multicall3 round-trip)"""
         if not self.connected:
             return None
-        
-        # Use 1 WBNB as input amount (18 decimals)
-        amount_in = 10**18
-        path = [WBNB_ADDRESS, BUSD_ADDRESS]
-        
+
+        # Re-evaluate the pool each scan; switch if a better endpoint warmed up
+        best_rpc = self._pick_endpoint()
+        if best_rpc != self.current_rpc:
+            self._use_endpoint(best_rpc)
+
+        # Quotes only move when the chain head does - reuse the last result
+        # while we are still on the same block
+        try:
+            block_number = await self.w3.eth.block_number
+        except Exception as e:
+            self._mark_cold(self.current_rpc)
+            block_number = None
+
+        if block_number is not None and block_number == self.last_block:
+            return self.cached_prices
+
+        try:
+            start = time.perf_counter()
+            results = await self.multicall.functions.aggregate3([
+                (self.pancake_addr, True, QUOTE_CALLDATA),
+                (self.biswap_addr, True, QUOTE_CALLDATA),
+            ]).call()
+            self._record_latency(self.current_rpc, time.perf_counter() - start)
+
+            prices = {}
+            for dex, (success, return_data) in zip(("pancakeswap", "biswap"), results):
+                if success and len(return_data) >= 128:
+                    # Fixed return layout: offset, length, amounts[0], amounts[1].
+                    # Slice the two value words directly - no ABI-decoder walk
+                    amount_in = int.from_bytes(return_data[64:96], "big")
+                    amount_out = int.from_bytes(return_data[96:128], "big")
+                    prices[dex] = amount_out / amount_in
+
+            if len(prices) != 2:
+                prices = None
+        except Exception as e:
+            # Multicall unavailable - bench this endpoint and fall back
+            self._mark_cold(self.current_rpc)
+            prices = await self._get_prices_parallel()
+
+        if block_number is not None:
+            self.last_block = block_number
+            self.cached_prices = prices
+
+        return prices
+
+    async def _get_prices_parallel(self) -> Optional[Dict[str, float]]:
+        """Fallback: fetch both router quotes concurrently"""
+        pancake_price, biswap_price = await asyncio.gather(
+            self.get_price_from_router(self.pancake_addr),
+            self.get_price_from_router(self.biswap_addr)
+        )
+
         prices = {}
-        
-        # Get PancakeSwap price
-        pancake_price = self.get_price_from_router(self.pancake_router, amount_in, path)
         if pancake_price:
             prices["pancakeswap"] = pancake_price
-        
-        # Get BiSwap price
-        biswap_price = self.get_price_from_router(self.biswap_router, amount_in, path)
         if biswap_price:
             prices["biswap"] = biswap_price
-        
+
         return prices if len(prices) == 2 else None
 
+async def subscribe_new_heads():
+    """Open a WebSocket newHeads subscription, or None if unavailable"""
+    if not WEBSOCKETS_AVAILABLE:
+        return None
+
+    try:
+        ws = await websockets.connect(BSC_WS_ENDPOINT)
+        await ws.send(json.dumps({
+            "jsonrpc": "2.0",
+            "id": 1,
+            "method": "eth_subscribe",
+            "params": ["newHeads"]
+        }))
+        await ws.recv()  # subscription confirmation
+        return ws
+    except Exception as e:
+        return None
+
+async def wait_for_new_block(ws):
+    """Block until the node pushes the next newHeads notification"""
+    while True:
+        msg = json.loads(await ws.recv())
+        if msg.get("method") == "eth_subscription":
+            return
+
 def simulate_flash_arbitrage(price_buy: float, price_sell: float, buy_fee: float, sell_fee: float) -> Tuple[float, float, float, float, float]:
     """Simulate flash loan arbitrage trade"""
-    flash_loan_fee = FLASH_LOAN_AMOUNT_USD * FLASH_LOAN_FEE
-    effective_capital = FLASH_LOAN_AMOUNT_USD - flash_loan_fee
-    
-    tokens_bought = (effective_capital / price_buy) * (1 - buy_fee)
+    tokens_bought = (_EFFECTIVE_CAPITAL / price_buy) * (1 - buy_fee)
     tokens_after_sell_fee = tokens_bought * (1 - sell_fee)
     usd_return = tokens_after_sell_fee * price_sell
-    
+
     gross_profit = usd_return - FLASH_LOAN_AMOUNT_USD
-    net_profit = gross_profit - GAS_COST_USD
+    net_profit = usd_return - _GAS_ADJUST
     roi = (net_profit / FLASH_LOAN_AMOUNT_USD) * 100
-    
+
     return tokens_bought, usd_return, gross_profit, net_profit, roi
 
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True)
+    def _best_net_kernel(prices_buy, prices_sell, fees_buy, fees_sell,
+                         effective_capital, gas_adjust):
+        """Native-code search for the most profitable direction"""
+        best_idx = 0
+        best_net = -1e308
+        for i in range(prices_buy.shape[0]):
+            usd_out = ((effective_capital / prices_buy[i]) * (1.0 - fees_buy[i])
+                       * (1.0 - fees_sell[i]) * prices_sell[i])
+            net = usd_out - gas_adjust
+            if net > best_net:
+                best_net = net
+                best_idx = i
+        return best_idx, best_net
+
+    # Trigger compilation at import so the first tick does not pay for it
+    _best_net_kernel(np.ones(1), np.ones(1), np.zeros(1), np.zeros(1), 0.0, 0.0)
+
 def check_arbitrage(prices: Dict[str, float]) -> Optional[dict]:
     """Check for arbitrage opportunity"""
+    if NUMPY_AVAILABLE:
+        return _check_arbitrage_vectorized(prices)
+    return _check_arbitrage_scalar(prices)
+
+def _check_arbitrage_vectorized(prices: Dict[str, float]) -> Optional[dict]:
+    """Evaluate both trade directions with one set of array ops"""
     pancake = prices["pancakeswap"]
     biswap = prices["biswap"]
-    
+
+    # Row 0: buy PancakeSwap / sell BiSwap; row 1: the reverse
+    prices_buy = np.array([pancake, biswap])
+    prices_sell = np.array([biswap, pancake])
+    fees_buy = np.array([PANCAKESWAP_FEE, BISWAP_FEE])
+    fees_sell = np.array([BISWAP_FEE, PANCAKESWAP_FEE])
+
+    if NUMBA_AVAILABLE:
+        idx, best_net = _best_net_kernel(prices_buy, prices_sell, fees_buy,
+                                         fees_sell, _EFFECTIVE_CAPITAL, _GAS_ADJUST)
+        idx = int(idx)
+    else:
+        usd_out = ((_EFFECTIVE_CAPITAL / prices_buy) * (1 - fees_buy)
+                   * (1 - fees_sell) * prices_sell)
+        net = usd_out - _GAS_ADJUST
+        idx = int(np.argmax(net))
+        best_net = net[idx]
+
+    if best_net <= MIN_PROFIT_THRESHOLD:  # Check net profit, not spread
+        return None
+
+    # Fill in the details for the winning direction only
+    tokens = (_EFFECTIVE_CAPITAL / prices_buy[idx]) * (1 - fees_buy[idx])
+    usd_return = tokens * (1 - fees_sell[idx]) * prices_sell[idx]
+
+    dex_names = ("PancakeSwap", "BiSwap")
+    spread = ((prices_sell[idx] - prices_buy[idx]) / prices_buy[idx]) * 100
+
+    return {
+        "buy_dex": dex_names[idx],
+        "sell_dex": dex_names[1 - idx],
+        "buy_price": float(prices_buy[idx]),
+        "sell_price": float(prices_sell[idx]),
+        "spread": float(spread),
+        "tokens": float(tokens),
+        "usd_out": float(usd_return),
+        "gross": float(usd_return - FLASH_LOAN_AMOUNT_USD),
+        "net": float(best_net),
+        "roi": float(best_net / FLASH_LOAN_AMOUNT_USD * 100)
+    }
+
+def _check_arbitrage_scalar(prices: Dict[str, float]) -> Optional[dict]:
+    """Pure-Python fallback when NumPy is not installed"""
+    pancake = prices["pancakeswap"]
+    biswap = prices["biswap"]
+
     spread_buy_pancake = ((biswap - pancake) / pancake) * 100
     spread_buy_biswap = ((pancake - biswap) / biswap) * 100
-    
+
     best_opp = None
-    
+
     # Check: Buy on PancakeSwap, Sell on BiSwap
     tokens, usd_out, gross, net, roi = simulate_flash_arbitrage(
         pancake, biswap, PANCAKESWAP_FEE, BISWAP_FEE
@@ -232,7 +654,8 @@ def print_arbitrage_opportunity(opp: dict):
     print(f"  ROI:               {Colors.GREEN}{opp['roi']:.4f}%{Colors.END}")
     print(f"{Colors.CYAN}{'=' * 70}{Colors.END}\n")
 
-def main():
+async def main():
+    init_clock()
     print(f"\n{Colors.CYAN}{Colors.BOLD}{'=' * 70}")
     print("BSC ARBITRAGE BOT - WEB3 REAL-TIME VERSION")
     print("Direct Blockchain Price Feeds + PostgreSQL Logging")
@@ -268,8 +691,8 @@ def main():
         log("Database module not available - running without logging", Colors.YELLOW)
     
     fetcher = Web3PriceFetcher()
-    
-    if not fetcher.connected:
+
+    if not await fetcher.connect():
         log("Could not connect to BSC network. Exiting...", Colors.RED)
         return
     
@@ -283,53 +706,66 @@ def main():
     
     log("\nStarting real-time monitoring... (Press Ctrl+C to stop)", Colors.GREEN)
     log("Prices fetched directly from smart contracts\n", Colors.CYAN)
+
+    # Scan on each new block when a WebSocket is available; otherwise poll
+    ws = await subscribe_new_heads()
+    if ws:
+        log("Subscribed to newHeads - scanning once per block", Colors.GREEN)
+    else:
+        log("WebSocket unavailable - falling back to 2s polling", Colors.YELLOW)
     
     iteration = 0
     opportunities_found = 0
-    last_prices = {"pancakeswap": None, "biswap": None}
-    
+    last_pancake = None
+    last_biswap = None
+    last_heartbeat = 0.0
+    db_writer = DatabaseWriter(db) if db else None
+
     try:
         while True:
             iteration += 1
             
-            prices = fetcher.get_wbnb_price_busd()
-            
+            prices = await fetcher.get_wbnb_price_busd()
+
             if not prices:
                 log("Failed to fetch prices, retrying...", Colors.YELLOW)
-                time.sleep(10)
+                await asyncio.sleep(10)
                 continue
             
             pancake = prices["pancakeswap"]
             biswap = prices["biswap"]
             
-            # Detect changes
-            prices_changed = (
-                last_prices["pancakeswap"] != pancake or 
-                last_prices["biswap"] != biswap
-            )
+            # Detect changes (plain float compares, no dict lookups)
+            prices_changed = last_pancake != pancake or last_biswap != biswap
             
             # Calculate spread
             spread = abs(biswap - pancake) / min(pancake, biswap) * 100
             
-            # Log to database (every scan, including stale ones)
+            # Detect the opportunity up front: scans that carry one must be
+            # written through synchronously (the opportunity row needs the
+            # scan id), everything else goes to the background writer
+            opportunity = check_arbitrage(prices) if (prices_changed or iteration == 1) else None
+
             scan_id = None
-            if db:
+            if db and opportunity:
                 scan_id = db.log_price_scan(
                     pancake_price=pancake,
                     biswap_price=biswap,
                     spread=spread,
                     price_changed=prices_changed
                 )
+            elif db_writer:
+                db_writer.put_scan((datetime.now(), pancake, biswap, spread, prices_changed))
             
-            timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
-            
+            timestamp = fast_timestamp()
+
             if prices_changed or iteration == 1:
                 print(f"\n{Colors.BOLD}[{timestamp}] Update #{iteration}{Colors.END}")
                 
                 # Show change indicators
-                if last_prices["pancakeswap"] is not None:
-                    p_change = pancake - last_prices["pancakeswap"]
-                    b_change = biswap - last_prices["biswap"]
+                if last_pancake is not None:
+                    p_change = pancake - last_pancake
+                    b_change = biswap - last_biswap
                     
                     p_ind = f" {Colors.GREEN}↑{Colors.END}" if p_change > 0 else (f" {Colors.RED}↓{Colors.END}" if p_change < 0 else "")
                     b_ind = f" {Colors.GREEN}↑{Colors.END}" if b_change > 0 else (f" {Colors.RED}↓{Colors.END}" if b_change < 0 else "")
@@ -344,11 +780,10 @@ def main():
                 if db and scan_id:
                     print(f"  {Colors.CYAN}DB Scan ID:  {scan_id}{Colors.END}")
                 
-                opportunity = check_arbitrage(prices)
                 if opportunity:
                     opportunities_found += 1
                     print_arbitrage_opportunity(opportunity)
-                    
+
                     # Log opportunity to database
                     if db and scan_id:
                         opportunity['flash_loan_amount'] = FLASH_LOAN_AMOUNT_USD
@@ -357,20 +792,36 @@ def main():
                 else:
                     print(f"  {Colors.YELLOW}No opportunity{Colors.END}")
                 
-                last_prices = prices.copy()
+                last_pancake = pancake
+                last_biswap = biswap
             else:
-                # Compact display (but still logged to DB)
-                db_indicator = f" [DB:{scan_id}]" if (db and scan_id) else ""
-                print(f"[{timestamp}] Monitoring... (no change){db_indicator}", end='\r')
-            
-            time.sleep(2)  # Check every 2 seconds
+                # Compact display (but still logged to DB) - throttled to
+                # ~1 Hz so terminal writes stay off the hot path
+                now = time.monotonic()
+                if now - last_heartbeat >= 1.0:
+                    db_indicator = f" [DB:{scan_id}]" if (db and scan_id) else ""
+                    print(f"[{timestamp}] Monitoring... (no change){db_indicator}", end='\r')
+                    last_heartbeat = now
             
-    except KeyboardInterrupt:
+            if ws:
+                try:
+                    await wait_for_new_block(ws)
+                except Exception as e:
+                    log("WebSocket dropped - falling back to 2s polling", Colors.YELLOW)
+                    ws = None
+            else:
+                await asyncio.sleep(2)  # Check every 2 seconds
+
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        # Ctrl+C under asyncio.run arrives as task cancellation, not
+        # KeyboardInterrupt - catch both so the session wrap-up runs
         print()
         log("\nBot stopped by user", Colors.YELLOW)
         
         # End database session
         if db and session_id:
+            if db_writer:
+                db_writer.flush()
             db.end_session(session_id, iteration, opportunities_found)
             log(f"Session ended - {iteration} scans, {opportunities_found} opportunities", Colors.CYAN)
             
@@ -407,4 +858,10 @@ def main():
             db.close()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    if UVLOOP_AVAILABLE:
+        # libuv-backed loop: cheaper per-await dispatch than the selector loop
+        uvloop.install()
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass  # shutdown summary already printed inside main()
\ No newline at end of file
@@ -2,9 +2,15 @@
 Flash Loan Arbitrage Bot - MAINNET Live Execution
 Executes real arbitrage trades on BSC mainnet
 """
+import asyncio
+import functools
+import queue
+import sys
+import threading
 import time
 import json
 import os
+from collections import namedtuple
 from pathlib import Path
 from datetime import datetime
 from typing import Optional, Dict, Tuple
@@ -13,12 +19,38 @@ from dotenv import load_dotenv
 load_dotenv(".env.live")
 
 try:
-    from web3 import Web3
+    import aiohttp
+    from web3 import Web3, AsyncWeb3, AsyncHTTPProvider
+    from eth_abi import decode as abi_decode, encode as abi_encode
     WEB3_AVAILABLE = True
 except ImportError:
     WEB3_AVAILABLE = False
     print("⚠️  Web3.py not installed. Install with: pip install web3")
 
+try:
+    import websockets
+    WEBSOCKETS_AVAILABLE = True
+except ImportError:
+    WEBSOCKETS_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = NUMPY_AVAILABLE
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 try:
     from database_live import ArbitrageDatabase
     DATABASE_AVAILABLE = True
@@ -41,6 +73,7 @@ TRADING_CONFIG = {
 NETWORKS = {
     "bsc_mainnet": {
         "rpc": "https://bsc-dataseed1.binance.org",
+        "ws": "wss://bsc-ws-node.nariox.org:443",
         "chain_id": 56,
         "explorer": "https://bscscan.com",
     },
@@ -62,6 +95,97 @@ CONTRACT_CONFIG = {
     },
 }
 
+# UniswapV2 swap fee per router, expressed as the basis-points kept by the
+# trader (PancakeSwap 0.25% fee -> 9975, BiSwap 0.1% fee -> 9990)
+ROUTER_FEE_BPS = {
+    "pancakeswap": 9975,
+    "biswap": 9990,
+}
+
+# === MULTICALL3 (same address on all EVM chains) ===
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+
+# Minimal hand-written ABI fragments covering only the functions the bot
+# actually calls. Skips parsing the full JSON ABIs at startup, and keeps
+# contract.functions dispatch from walking hundreds of unused fragments
+ROUTER_V2_ABI = [
+    {
+        "inputs": [
+            {"name": "amountIn", "type": "uint256"},
+            {"name": "path", "type": "address[]"}
+        ],
+        "name": "getAmountsOut",
+        "outputs": [{"name": "amounts", "type": "uint256[]"}],
+        "stateMutability": "view",
+        "type": "function"
+    }
+]
+
+ERC20_ABI = [
+    {
+        "inputs": [{"name": "account", "type": "address"}],
+        "name": "balanceOf",
+        "outputs": [{"name": "", "type": "uint256"}],
+        "stateMutability": "view",
+        "type": "function"
+    },
+    {
+        "inputs": [],
+        "name": "decimals",
+        "outputs": [{"name": "", "type": "uint8"}],
+        "stateMutability": "view",
+        "type": "function"
+    }
+]
+
+FLASH_LOAN_ARBITRAGE_ABI = [
+    {
+        "inputs": [
+            {"name": "borrowedToken", "type": "address"},
+            {"name": "borrowAmount", "type": "uint256"},
+            {"name": "isBase", "type": "bool"},
+            {"name": "buyRouter", "type": "address"},
+            {"name": "sellRouter", "type": "address"},
+            {"name": "pathBuy", "type": "address[]"},
+            {"name": "pathSell", "type": "address[]"},
+            {"name": "minProfit", "type": "uint256"}
+        ],
+        "name": "executeArbitrageV2",
+        "outputs": [],
+        "stateMutability": "nonpayable",
+        "type": "function"
+    }
+]
+
+MULTICALL3_ABI = [
+    {
+        "inputs": [
+            {
+                "components": [
+                    {"name": "target", "type": "address"},
+                    {"name": "allowFailure", "type": "bool"},
+                    {"name": "callData", "type": "bytes"}
+                ],
+                "name": "calls",
+                "type": "tuple[]"
+            }
+        ],
+        "name": "aggregate3",
+        "outputs": [
+            {
+                "components": [
+                    {"name": "success", "type": "bool"},
+                    {"name": "returnData", "type": "bytes"}
+                ],
+                "name": "returnData",
+                "type": "tuple[]"
+            }
+        ],
+        "stateMutability": "payable",
+        "type": "function"
+    }
+]
+
 ABI_DIR = Path(__file__).parent / "abi"
 
 class Colors:
@@ -74,12 +198,26 @@ class Colors:
     BOLD = "\033[1m"
     END = "\033[0m"
 
+_last_hms = ("", 0)
+
+def _hms() -> str:
+    """Cached HH:MM:SS, re-formatted only when the wall-clock second
+    changes - strftime per log line adds up in a tight scan loop"""
+    global _last_hms
+    now = int(time.time())
+    if now != _last_hms[1]:
+        _last_hms = (time.strftime("%H:%M:%S"), now)
+    return _last_hms[0]
+
+# Banner divider, built once instead of '=' * 80 at every print site
+_DIV = "=" * 80
+
 def log(message: str, color: str = ""):
-    timestamp = datetime.now().strftime("%H:%M:%S")
-    print(f"{color}[{timestamp}] {message}{Colors.END}")
+    print(f"{color}[{_hms()}] {message}{Colors.END}")
 
+@functools.lru_cache(maxsize=None)
 def load_abi(filename: str) -> list:
-    """Load ABI from JSON file"""
+    """Load ABI from JSON file (parsed once per filename; treat as read-only)"""
     abi_path = ABI_DIR / filename
     if not abi_path.exists():
         raise FileNotFoundError(f"ABI file not found: {abi_path}")
@@ -94,6 +232,31 @@ def load_abi(filename: str) -> list:
     else:
         raise ValueError(f"Invalid ABI format in {filename}")
 
+# Flat per-router metadata resolved once at startup, so the scan loop reads
+# attributes instead of re-hashing dict lookups
+Router = namedtuple("Router", "name contract address fee_bps")
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True)
+    def _simulate_all_pairs(prices, fees, borrowed, repay, gas_cost):
+        """Native-code all-pairs simulation: fills the spread and net-profit
+        matrices and tracks the widest-spread direction in a single pass"""
+        k = prices.shape[0]
+        spreads = np.empty((k, k))
+        net = np.empty((k, k))
+        wbnb_bought = (borrowed / prices) * (1.0 - fees)
+        best_i, best_j, best_abs = 0, 1, -1.0
+        for i in range(k):
+            for j in range(k):
+                usdt_out = wbnb_bought[i] * (1.0 - fees[j]) * prices[j]
+                net[i, j] = usdt_out - repay - gas_cost
+                s = (prices[j] - prices[i]) / prices[i] * 100.0
+                spreads[i, j] = s
+                if i != j and abs(s) > best_abs:
+                    best_abs = abs(s)
+                    best_i, best_j = i, j
+        return spreads, net, wbnb_bought, best_i, best_j
+
 class ArbitrageBot:
     def __init__(self, private_key: str, dry_run: bool = True):
         self.network = "bsc_mainnet"
@@ -101,26 +264,63 @@ class ArbitrageBot:
         self.private_key = private_key
         self.db = None
         self.session_id = None
-        
+        self._db_queue = None
+
+        # Display output is buffered here and drained by a daemon thread,
+        # so stdio writes never sit inside the scan loop
+        self._logq = queue.Queue()
+        threading.Thread(target=self._log_worker, daemon=True).start()
+
         if not WEB3_AVAILABLE:
             raise ImportError("Web3.py is required")
         
-        # Connect to BSC mainnet
+        # Connect to BSC mainnet; every price fetch runs concurrently on the
+        # async provider, so a scan costs max(RTT) instead of sum(RTT)
         net_config = NETWORKS["bsc_mainnet"]
-        self.w3 = Web3(Web3.HTTPProvider(net_config["rpc"]))
+        self._provider = AsyncHTTPProvider(net_config["rpc"], request_kwargs={"timeout": 10})
+        self.w3 = AsyncWeb3(self._provider)
+        self._chain_id = net_config["chain_id"]
+
+        # Optional request pacing for free-tier RPC endpoints: enforcing a
+        # minimum gap between requests keeps throughput at the provider's
+        # allowed rate instead of oscillating between bursts and seconds-long
+        # throttled stalls. Off by default (RPC_MIN_GAP_S unset/0) - paid
+        # endpoints handle the concurrent scan traffic fine
+        self._rpc_min_gap = float(os.getenv("RPC_MIN_GAP_S", "0") or 0)
+        if self._rpc_min_gap > 0:
+            self._install_rpc_pacer(self._rpc_min_gap)
+            log(f"RPC pacing enabled: {self._rpc_min_gap * 1000:.0f}ms min gap", Colors.YELLOW)
+
+        if ORJSON_AVAILABLE:
+            # Swap the provider's JSON codec for orjson - the C parser is
+            # what matters when multicall responses get large. default=str
+            # covers the odd Decimal web3 slips into params
+            provider = self._provider
+
+            def _encode_rpc_request(method, params):
+                return orjson.dumps({
+                    "jsonrpc": "2.0",
+                    "method": method,
+                    "params": params or [],
+                    "id": next(provider.request_counter),
+                }, default=str)
+
+            provider.encode_rpc_request = _encode_rpc_request
+            provider.decode_rpc_response = orjson.loads
 
         # Add PoA middleware for BSC
         try:
-            from web3.middleware import geth_poa_middleware
-            self.w3.middleware_onion.inject(geth_poa_middleware, layer=0)
+            from web3.middleware import async_geth_poa_middleware
+            self.w3.middleware_onion.inject(async_geth_poa_middleware, layer=0)
         except ImportError:
             log("PoA middleware not available", Colors.YELLOW)
-                
-        if not self.w3.is_connected():
-            raise ConnectionError(f"Failed to connect to BSC mainnet")
-        
-        log(f"✓ Connected to BSC Mainnet", Colors.GREEN)
-        
+
+        # Second instance on the same provider (and session) but without the
+        # PoA middleware: eth_call-heavy traffic - quotes, multicall,
+        # balances - never touches block extraData, so it skips that
+        # per-call middleware dispatch. Blocks/receipts stay on self.w3
+        self.w3_fast = AsyncWeb3(self._provider)
+
         # Setup account
         self.account = self.w3.eth.account.from_key(private_key)
         self.address = self.account.address
@@ -129,12 +329,11 @@ class ArbitrageBot:
         # Load config
         self.config = CONTRACT_CONFIG["bsc_mainnet"]
         
-        # Load ABIs
-        log("Loading ABIs...", Colors.BLUE)
-        self.arbitrage_abi = load_abi("FlashLoanArbitrage.json")
-        self.router_abi = load_abi("RouterV2.json")
-        self.erc20_abi = load_abi("ERC20.json")
-        log("ABIs loaded", Colors.GREEN)
+        # Minimal ABI fragments defined at module level - nothing to parse
+        # from disk, and every contract carries only the functions it uses
+        self.arbitrage_abi = FLASH_LOAN_ARBITRAGE_ABI
+        self.router_abi = ROUTER_V2_ABI
+        self.erc20_abi = ERC20_ABI
         
         # Initialize contracts
         self.arbitrage_contract = self.w3.eth.contract(
@@ -145,15 +344,80 @@ class ArbitrageBot:
         # DEX routers
         self.routers = {}
         for name, addr in self.config["v2_routers"].items():
-            self.routers[name] = self.w3.eth.contract(
+            self.routers[name] = self.w3_fast.eth.contract(
                 address=Web3.to_checksum_address(addr),
                 abi=self.router_abi,
             )
             log(f"  Router: {name}", Colors.CYAN)
-        
-        # Token addresses
+
+        self._routers_list = [
+            Router(name, contract, contract.address, ROUTER_FEE_BPS.get(name, 9975))
+            for name, contract in self.routers.items()
+        ]
+        self._router_map = {router.name: router for router in self._routers_list}
+        self._router_names = tuple(self.routers)
+
+        # Multicall3 aggregator: one eth_call returns every router quote
+        self.multicall = self.w3_fast.eth.contract(
+            address=Web3.to_checksum_address(MULTICALL3_ADDRESS),
+            abi=MULTICALL3_ABI,
+        )
+
+        # Token addresses (checksummed once here - EIP-55 checksumming is a
+        # keccak per address, too expensive to redo on every scan)
         self.tokens = self.config["tokens"]
-        
+        self.tokens_cs = {k: Web3.to_checksum_address(v) for k, v in self.tokens.items()}
+
+        # Trade paths are fixed for this strategy - build the checksummed
+        # tuples once and hand them to executors via the opportunity dict
+        self._path_buy_cs = (self.tokens_cs["USDT"], self.tokens_cs["WBNB"])
+        self._path_sell_cs = (self.tokens_cs["WBNB"], self.tokens_cs["USDT"])
+
+        # Config-derived wei amounts never change at runtime - convert once
+        # instead of round-tripping through to_wei's Decimal path every scan
+        self._borrow_wei = Web3.to_wei(TRADING_CONFIG["borrow_amount"], "ether")
+        self._min_profit_wei = Web3.to_wei(TRADING_CONFIG["min_profit"], "ether")
+
+        # ERC20 contract objects, built lazily and reused (contract
+        # construction re-validates the ABI every time), plus the immutable
+        # per-token decimals, fetched once via multicall
+        self._erc20_cache = {}
+        self._decimals_cache = {}
+
+        # Short-TTL gas price cache + locally tracked nonce, saving two RPCs
+        # per attempted trade
+        self._gas_price_cache = (0.0, None)
+        self._nonce = None
+
+        # Gas limit per (buy_router, sell_router) pair: estimated once with
+        # a margin, then reused - the route's gas profile doesn't change
+        self._gas_cache = {}
+
+        # Single-slot (block_number, amounts_out) cache: quotes are
+        # deterministic within a block, so rescans before the next block
+        # cost one eth_blockNumber instead of the full quote fetch
+        self._quote_cache = (None, None)
+        self._quote_cache_hits = 0
+
+        # In-flight transactions confirming in the background
+        self._pending = {}
+
+        # 4-byte selectors for raw eth_calls, plus the Sync event topic used
+        # by the websocket subscription. Stored as plain bytes - HexBytes
+        # .hex() is 0x-prefixed, which double-prefixes the manual
+        # '"0x" + sel.hex()' calldata built on the raw-call paths
+        self._selector_get_amounts_out = bytes(Web3.keccak(text="getAmountsOut(uint256,address[])")[:4])
+        self._selector_factory = bytes(Web3.keccak(text="factory()")[:4])
+        self._selector_get_pair = bytes(Web3.keccak(text="getPair(address,address)")[:4])
+        self._selector_token0 = bytes(Web3.keccak(text="token0()")[:4])
+        self._selector_get_reserves = bytes(Web3.keccak(text="getReserves()")[:4])
+        self._sync_topic = Web3.to_hex(Web3.keccak(text="Sync(uint112,uint112)"))
+
+        # Pair metadata (resolved once) and their latest reserves, letting
+        # the scan price swaps locally instead of calling getAmountsOut
+        self._pairs = {}
+        self._reserves = {}
+
         # Initialize database
         if DATABASE_AVAILABLE:
             self._init_database()
@@ -173,49 +437,398 @@ class ArbitrageBot:
             self.session_id = self.db.start_session()
             if self.session_id:
                 log(f"Database session started (ID: {self.session_id})", Colors.GREEN)
+
+            # Routine scans are queued here and flushed by a background
+            # thread in batched inserts, keeping Postgres round-trips out
+            # of the scan loop
+            self._db_queue = queue.Queue(maxsize=1000)
+            threading.Thread(target=self._db_worker, daemon=True).start()
         else:
             log("Running without database", Colors.YELLOW)
             self.db = None
-    
-    def get_balance(self) -> float:
+
+    def _install_rpc_pacer(self, min_gap: float):
+        """Wrap the provider's make_request with a monotonic-clock gate that
+        spaces requests at least min_gap seconds apart. The async equivalent
+        of a requests.Session response hook - every RPC (including the
+        concurrent quote gathers) funnels through the single provider, so one
+        gate paces them all"""
+        inner = self._provider.make_request
+        lock = asyncio.Lock()
+        state = {"last": 0.0}
+
+        async def paced_make_request(method, params):
+            async with lock:
+                wait = state["last"] + min_gap - time.monotonic()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                state["last"] = time.monotonic()
+            return await inner(method, params)
+
+        self._provider.make_request = paced_make_request
+
+    def _log_worker(self):
+        """Drain buffered display output to stdout off the scan loop"""
+        while True:
+            chunks = [self._logq.get()]
+            try:
+                while len(chunks) < 50:
+                    chunks.append(self._logq.get_nowait())
+            except queue.Empty:
+                pass
+            sys.stdout.write("".join(chunks))
+            sys.stdout.flush()
+
+    def _db_worker(self):
+        """Background writer: drains queued scans into batched inserts every
+        ~1s or 100 records, whichever comes first"""
+        while True:
+            batch = []
+            try:
+                batch.append(self._db_queue.get(timeout=1.0))
+                while len(batch) < 100:
+                    batch.append(self._db_queue.get_nowait())
+            except queue.Empty:
+                pass
+
+            if batch and self.db:
+                self.db.log_price_scans_batch(batch)
+
+    def _queue_scan(self, scan: tuple):
+        """Enqueue a scan for the background writer, dropping the oldest
+        record rather than blocking if the database falls behind"""
+        try:
+            self._db_queue.put_nowait(scan)
+        except queue.Full:
+            try:
+                self._db_queue.get_nowait()
+                self._db_queue.put_nowait(scan)
+            except (queue.Empty, queue.Full):
+                pass
+
+    def _flush_db_queue(self, timeout: float = 5.0):
+        """Best-effort drain of pending scans before shutdown"""
+        if self._db_queue is None:
+            return
+        deadline = time.monotonic() + timeout
+        while not self._db_queue.empty() and time.monotonic() < deadline:
+            time.sleep(0.1)
+
+    async def connect(self):
+        """Open the shared aiohttp session and verify RPC connectivity"""
+        session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=32, ttl_dns_cache=300),
+            timeout=aiohttp.ClientTimeout(total=10),
+        )
+        await self._provider.cache_async_session(session)
+
+        if not await self.w3.is_connected():
+            raise ConnectionError(f"Failed to connect to BSC mainnet")
+
+        log(f"✓ Connected to BSC Mainnet", Colors.GREEN)
+
+    async def get_balance(self) -> float:
         """Get native BNB balance"""
-        balance = self.w3.eth.get_balance(self.address)
+        balance = await self.w3_fast.eth.get_balance(self.address)
         return self.w3.from_wei(balance, "ether")
-    
-    def get_token_balance(self, token_symbol: str) -> float:
+
+    def _erc20(self, token_symbol: str):
+        """Cached ERC20 contract object for a configured token"""
+        token_contract = self._erc20_cache.get(token_symbol)
+        if token_contract is None:
+            token_contract = self.w3_fast.eth.contract(
+                address=self.tokens_cs[token_symbol],
+                abi=self.erc20_abi,
+            )
+            self._erc20_cache[token_symbol] = token_contract
+        return token_contract
+
+    async def _ensure_decimals(self):
+        """Populate the decimals cache for every configured token with a
+        single multicall (decimals are immutable, so this runs once)"""
+        if self._decimals_cache:
+            return
+
+        symbols = list(self.tokens_cs.keys())
+        calldata = self._erc20(symbols[0]).encodeABI(fn_name="decimals")
+        calls = [(self.tokens_cs[s], True, calldata) for s in symbols]
+        try:
+            results = await self.multicall.functions.aggregate3(calls).call()
+            for symbol, (success, return_data) in zip(symbols, results):
+                if success and return_data:
+                    self._decimals_cache[symbol] = abi_decode(["uint8"], return_data)[0]
+        except Exception:
+            pass
+        for symbol in symbols:
+            self._decimals_cache.setdefault(symbol, 18)
+
+    async def get_token_balance(self, token_symbol: str) -> float:
         """Get ERC20 token balance"""
         try:
-            token_addr = self.tokens.get(token_symbol)
-            if not token_addr:
+            if token_symbol not in self.tokens_cs:
                 return 0.0
-            
-            token_contract = self.w3.eth.contract(
-                address=Web3.to_checksum_address(token_addr),
-                abi=self.erc20_abi,
-            )
-            balance_wei = token_contract.functions.balanceOf(self.address).call()
-            return self.w3.from_wei(balance_wei, 'ether')
+
+            await self._ensure_decimals()
+            balance_wei = await self._erc20(token_symbol).functions.balanceOf(self.address).call()
+            return balance_wei / 10 ** self._decimals_cache[token_symbol]
         except Exception as e:
             log(f"Error getting {token_symbol} balance: {str(e)}", Colors.RED)
             return 0.0
-    
-    def get_price(self, router_contract, amount_in: int, path: list) -> Optional[int]:
-        """Get price from DEX"""
+
+    async def get_token_balances(self, token_symbols: list) -> Dict[str, float]:
+        """Fetch every token balance in one Multicall3 aggregate3 instead of
+        one balanceOf call per token"""
+        symbols = [s for s in token_symbols if s in self.tokens_cs]
+        if not symbols:
+            return {}
+
+        await self._ensure_decimals()
+        calldata = self._erc20(symbols[0]).encodeABI(fn_name="balanceOf", args=[self.address])
+        calls = [(self.tokens_cs[s], True, calldata) for s in symbols]
+        try:
+            results = await self.multicall.functions.aggregate3(calls).call()
+        except Exception:
+            # Node without multicall support - one call per token
+            values = await asyncio.gather(*(self.get_token_balance(s) for s in symbols))
+            return dict(zip(symbols, values))
+
+        balances = {}
+        for symbol, (success, return_data) in zip(symbols, results):
+            if success and return_data:
+                balance_wei = abi_decode(["uint256"], return_data)[0]
+                balances[symbol] = balance_wei / 10 ** self._decimals_cache[symbol]
+            else:
+                balances[symbol] = 0.0
+        return balances
+
+    async def get_gas_price(self) -> int:
+        """Gas price with a ~3s TTL - BSC gas moves slowly, no need to
+        refetch it for every transaction build"""
+        ts, value = self._gas_price_cache
+        if value is None or time.monotonic() - ts > 3.0:
+            value = await self.w3.eth.gas_price
+            self._gas_price_cache = (time.monotonic(), value)
+        return value
+
+    async def _next_nonce(self) -> int:
+        """Locally tracked nonce: synced from chain once, bumped after each
+        successful send, resynced when the node complains"""
+        if self._nonce is None:
+            self._nonce = await self.w3.eth.get_transaction_count(self.address, 'pending')
+        return self._nonce
+
+    async def get_price(self, router_contract, amount_in: int, path: list) -> Optional[int]:
+        """Get price from DEX (path must already be checksummed)"""
         try:
-            path_checksum = [Web3.to_checksum_address(addr) for addr in path]
-            amounts = router_contract.functions.getAmountsOut(amount_in, path_checksum).call()
+            amounts = await router_contract.functions.getAmountsOut(amount_in, path).call()
             return amounts[-1]
         except Exception as e:
             log(f"Price fetch error: {str(e)[:50]}", Colors.RED)
             return None
-    
-    def find_arbitrage_opportunity(self) -> Dict:
+
+    @functools.lru_cache(maxsize=32)
+    def _encode_get_amounts_out(self, amount_in: int, path: tuple) -> str:
+        """Hex calldata for getAmountsOut, memoized - the scan quotes one
+        fixed (amount, path) so after the first scan this is a dict hit
+        instead of an abi_encode"""
+        calldata = self._selector_get_amounts_out + abi_encode(
+            ["uint256", "address[]"], [amount_in, list(path)]
+        )
+        return "0x" + calldata.hex()
+
+    async def _raw_get_amounts_out(self, router_addr: str, amount_in: int, path: tuple) -> Optional[int]:
+        """getAmountsOut via a raw eth_call, skipping the contract object's
+        argument normalization and the middleware stack on the hot path"""
+        try:
+            raw = await self.w3.provider.make_request(
+                "eth_call",
+                [{"to": router_addr, "data": self._encode_get_amounts_out(amount_in, path)}, "latest"],
+            )
+            result = raw.get("result")
+            if not result or result == "0x":
+                return None
+            amounts = abi_decode(["uint256[]"], bytes.fromhex(result[2:]))[0]
+            return amounts[-1]
+        except Exception as e:
+            log(f"Price fetch error: {str(e)[:50]}", Colors.RED)
+            return None
+
+    async def _ensure_pairs(self) -> bool:
+        """Resolve each router's WBNB/USDT pair address and token ordering
+        via factory.getPair/token0 (immutable, so each resolves once).
+        Routers that failed on a transient RPC error are retried on later
+        scans - only a complete pair map short-circuits"""
+        if len(self._pairs) == len(self.routers):
+            return True
+
+        token_wbnb = self.tokens_cs["WBNB"]
+        pair_args = abi_encode(
+            ["address", "address"],
+            [token_wbnb, self.tokens_cs["USDT"]],
+        )
+        for name, router in self.routers.items():
+            if name in self._pairs:
+                continue
+            try:
+                raw = await self.w3.provider.make_request(
+                    "eth_call",
+                    [{"to": router.address, "data": "0x" + self._selector_factory.hex()}, "latest"],
+                )
+                factory_addr = Web3.to_checksum_address("0x" + raw["result"][-40:])
+                raw = await self.w3.provider.make_request(
+                    "eth_call",
+                    [{"to": factory_addr, "data": "0x" + (self._selector_get_pair + pair_args).hex()}, "latest"],
+                )
+                pair_addr = "0x" + raw["result"][-40:]
+                if int(pair_addr, 16) == 0:
+                    continue
+                pair_addr = Web3.to_checksum_address(pair_addr)
+
+                raw = await self.w3.provider.make_request(
+                    "eth_call",
+                    [{"to": pair_addr, "data": "0x" + self._selector_token0.hex()}, "latest"],
+                )
+                token0_is_wbnb = raw["result"][-40:].lower() == token_wbnb[2:].lower()
+                self._pairs[name] = (pair_addr, token0_is_wbnb)
+            except Exception as e:
+                log(f"Pair lookup failed for {name}: {str(e)[:50]}", Colors.YELLOW)
+        return bool(self._pairs)
+
+    async def _resolve_pair_addresses(self) -> list:
+        """Pair addresses for the websocket Sync subscription"""
+        await self._ensure_pairs()
+        return [addr for addr, _ in self._pairs.values()]
+
+    async def _refresh_reserves(self) -> bool:
+        """Refresh every pair's reserves with a single multicall, stored as
+        (reserve_wbnb, reserve_usdt) regardless of token0 ordering"""
+        if not await self._ensure_pairs():
+            return False
+
+        names = list(self._pairs.keys())
+        calls = [(self._pairs[name][0], True, self._selector_get_reserves) for name in names]
+        try:
+            results = await self.multicall.functions.aggregate3(calls).call()
+        except Exception:
+            return False
+
+        updated = False
+        for name, (success, return_data) in zip(names, results):
+            if success and len(return_data) >= 96:
+                r0, r1, _ts = abi_decode(["uint112", "uint112", "uint32"], return_data)
+                _, token0_is_wbnb = self._pairs[name]
+                self._reserves[name] = (r0, r1) if token0_is_wbnb else (r1, r0)
+                updated = True
+        return updated
+
+    @staticmethod
+    def _amount_out(amount_in: int, reserve_in: int, reserve_out: int, fee_bps: int) -> int:
+        """UniswapV2 constant-product quote - pure integer math, identical
+        to the router's getAmountsOut"""
+        amount_with_fee = amount_in * fee_bps
+        return amount_with_fee * reserve_out // (reserve_in * 10000 + amount_with_fee)
+
+    async def get_prices_local(self, router_names: list, amount_in: int) -> Optional[Dict[str, Optional[int]]]:
+        """Quote WBNB→USDT on every router from fresh pair reserves: one
+        getReserves multicall replaces all getAmountsOut eth_calls and the
+        swap math runs locally in sub-millisecond integer arithmetic"""
+        if not await self._refresh_reserves():
+            return None
+
+        amounts = {}
+        for router in self._routers_list:
+            reserves = self._reserves.get(router.name)
+            if reserves is None:
+                # A router without reserves (unresolved pair or a failed
+                # multicall slot) can't be priced locally - signal the
+                # caller to fall through to the quote fallbacks rather
+                # than handing back a dict that's missing a leg
+                return None
+            reserve_wbnb, reserve_usdt = reserves
+            amounts[router.name] = self._amount_out(
+                amount_in, reserve_wbnb, reserve_usdt, router.fee_bps
+            )
+        return amounts
+
+    async def subscribe_sync_events(self):
+        """Subscribe to Sync logs from our V2 pairs so the scan loop wakes
+        only when a relevant pool actually moves, instead of polling blind"""
+        if not WEBSOCKETS_AVAILABLE:
+            return None
+        ws_url = NETWORKS["bsc_mainnet"].get("ws")
+        if not ws_url:
+            return None
+
+        pairs = await self._resolve_pair_addresses()
+        if not pairs:
+            return None
+
+        try:
+            ws = await websockets.connect(ws_url, ping_interval=20)
+            await ws.send(json.dumps({
+                "jsonrpc": "2.0",
+                "id": 1,
+                "method": "eth_subscribe",
+                "params": ["logs", {"address": pairs, "topics": [self._sync_topic]}],
+            }))
+            # A node can accept the connection but reject the filter - treat
+            # an error member (or a missing subscription id) as no socket,
+            # otherwise every scan would ride out the full wait_for_sync
+            # timeout against a subscription that can never fire
+            confirmation = json.loads(await ws.recv())
+            if confirmation.get("error") or not confirmation.get("result"):
+                log(f"WebSocket subscription rejected: {str(confirmation.get('error'))[:50]}", Colors.YELLOW)
+                await ws.close()
+                return None
+            log(f"✓ Subscribed to Sync events on {len(pairs)} pairs", Colors.GREEN)
+            return ws
+        except Exception as e:
+            log(f"WebSocket subscription unavailable: {str(e)[:50]}", Colors.YELLOW)
+            return None
+
+    async def wait_for_sync(self, ws, timeout: float):
+        """Block until one of our pairs emits Sync (timeout is a safety net
+        against silent websocket stalls)"""
+        while True:
+            message = json.loads(await asyncio.wait_for(ws.recv(), timeout=timeout))
+            if message.get("method") == "eth_subscription":
+                return
+
+    async def get_prices_batch(self, router_names: list, amount_in: int, path: tuple) -> Dict[str, Optional[int]]:
+        """Fire getAmountsOut at every router concurrently, so a scan costs
+        one round-trip instead of one per router"""
+        results = await asyncio.gather(
+            *(self._raw_get_amounts_out(self._router_map[name].address, amount_in, path)
+              for name in router_names)
+        )
+        return dict(zip(router_names, results))
+
+    async def get_prices_multicall(self, router_names: list, amount_in: int, path: tuple) -> Optional[Dict[str, Optional[int]]]:
+        """Pack every router's getAmountsOut into one Multicall3 aggregate3,
+        so quote latency stays at one eth_call regardless of router count"""
+        calldata = self._encode_get_amounts_out(amount_in, path)
+        calls = [(self._router_map[name].address, True, calldata) for name in router_names]
+
+        try:
+            results = await self.multicall.functions.aggregate3(calls).call()
+        except Exception as e:
+            return None
+
+        amounts = {}
+        for name, (success, return_data) in zip(router_names, results):
+            if success and return_data:
+                amounts[name] = abi_decode(["uint256[]"], return_data)[0][-1]
+            else:
+                amounts[name] = None
+        return amounts
+
+    async def find_arbitrage_opportunity(self) -> Dict:
         """
         Find arbitrage opportunity by comparing WBNB prices on different DEXes
         Flash loan USDT → Buy WBNB on cheaper DEX → Sell WBNB on expensive DEX → Repay USDT
         """
-        token_usdt = self.tokens.get("USDT")
-        token_wbnb = self.tokens.get("WBNB")
+        token_usdt = self.tokens_cs.get("USDT")
+        token_wbnb = self.tokens_cs.get("WBNB")
         
         if not token_usdt or not token_wbnb:
             log("Missing token configuration", Colors.RED)
@@ -223,199 +836,349 @@ class ArbitrageBot:
         
         # Get WBNB price on each DEX (in USDT per WBNB)
         wbnb_amount = 10**18  # 1 WBNB
-        path_wbnb_to_usdt = [token_wbnb, token_usdt]  # WBNB → USDT
+        path_wbnb_to_usdt = self._path_sell_cs  # WBNB → USDT, built at init
         
         wbnb_prices = {}
-        router_names = list(self.routers.keys())
-        
-        for router_name in router_names:
-            router = self.routers[router_name]
-            usdt_for_wbnb = self.get_price(router, wbnb_amount, path_wbnb_to_usdt)
+        router_names = self._router_names
+
+        # Quotes are deterministic within a block: if the chain hasn't
+        # advanced since the last scan, reuse the cached amounts and pay
+        # one eth_blockNumber instead of the whole quote cascade
+        try:
+            block_number = await self.w3_fast.eth.block_number
+        except Exception:
+            block_number = None
+
+        if block_number is not None and block_number == self._quote_cache[0]:
+            amounts_out = self._quote_cache[1]
+            self._quote_cache_hits += 1
+        else:
+            amounts_out = await self.get_prices_local(router_names, wbnb_amount)
+            if amounts_out is None:
+                amounts_out = await self.get_prices_multicall(router_names, wbnb_amount, path_wbnb_to_usdt)
+            if amounts_out is None:
+                amounts_out = await self.get_prices_batch(router_names, wbnb_amount, path_wbnb_to_usdt)
+            if block_number is not None and amounts_out is not None:
+                self._quote_cache = (block_number, amounts_out)
+        for router_name, usdt_for_wbnb in amounts_out.items():
             if usdt_for_wbnb:
-                price = self.w3.from_wei(usdt_for_wbnb, 'ether')
-                wbnb_prices[router_name] = price
+                # Plain float division - from_wei's Decimal machinery is too
+                # expensive for something recomputed every scan
+                wbnb_prices[router_name] = usdt_for_wbnb / 1e18
         
         if len(wbnb_prices) < 2:
             return {"prices": {}, "spreads": {}, "profits": {}, "opportunity": None}
         
-        # Simulate arbitrage using these prices
-        FLASH_LOAN = TRADING_CONFIG["borrow_amount"]  # USDT to borrow
+        # Simulate arbitrage using these prices (already plain floats)
+        if NUMPY_AVAILABLE:
+            all_spreads, all_profits, best_opportunity = \
+                self._simulate_directions_vectorized(router_names, wbnb_prices)
+        else:
+            all_spreads, all_profits, best_opportunity = \
+                self._simulate_directions_scalar(router_names, wbnb_prices)
+
+        return {
+            "prices": wbnb_prices,
+            "spreads": all_spreads,
+            "profits": all_profits,
+            "opportunity": best_opportunity
+        }
+
+    def _build_opportunity(self, buy_router: str, sell_router: str, spread: float,
+                           buy_price: float, sell_price: float, wbnb_bought: float,
+                           usdt_received: float, gross_profit: float,
+                           net_profit: float) -> Dict:
+        """Assemble the executable opportunity dict - the only place the
+        scan converts floats back to wei"""
+        if gross_profit >= 0:
+            gross_profit_wei = self.w3.to_wei(gross_profit, 'ether')
+        else:
+            gross_profit_wei = -self.w3.to_wei(abs(gross_profit), 'ether')
+
+        if net_profit >= 0:
+            net_profit_wei = self.w3.to_wei(net_profit, 'ether')
+        else:
+            net_profit_wei = -self.w3.to_wei(abs(net_profit), 'ether')
+
+        return {
+            "buy_router": buy_router,
+            "sell_router": sell_router,
+            "buy_router_addr": self._router_map[buy_router].address,
+            "sell_router_addr": self._router_map[sell_router].address,
+            "borrow_amount": self._borrow_wei,
+            "intermediate_amount": self.w3.to_wei(wbnb_bought, 'ether'),
+            "final_amount": self.w3.to_wei(usdt_received, 'ether'),
+            "spread": spread,
+            "estimated_gross_profit": gross_profit_wei,
+            "estimated_net_profit": net_profit_wei,
+            "buy_price": buy_price,
+            "sell_price": sell_price,
+            "path_buy_cs": self._path_buy_cs,
+            "path_sell_cs": self._path_sell_cs,
+        }
+
+    def _simulate_directions_scalar(self, router_names: list, prices_f: Dict[str, float]):
+        """Evaluate every (buy, sell) direction in plain Python floats"""
         GAS_COST = TRADING_CONFIG.get("gas_cost_usd", 0.08)
         PANCAKE_FEE = 0.0025  # 0.25%
         BISWAP_FEE = 0.001    # 0.1%
-        
+
         all_spreads = {}
         all_profits = {}
         best_opportunity = None
-        
+
         # Check both directions
         for buy_router in router_names:
             for sell_router in router_names:
                 if buy_router == sell_router:
                     continue
-                
-                if buy_router not in wbnb_prices or sell_router not in wbnb_prices:
+
+                if buy_router not in prices_f or sell_router not in prices_f:
                     continue
-                
-                buy_price = float(wbnb_prices[buy_router])  # USDT per WBNB
-                sell_price = float(wbnb_prices[sell_router])  # USDT per WBNB
-                
+
+                buy_price = prices_f[buy_router]  # USDT per WBNB
+                sell_price = prices_f[sell_router]  # USDT per WBNB
+
                 # Get DEX fees
                 buy_fee = PANCAKE_FEE if buy_router == "pancakeswap" else BISWAP_FEE
                 sell_fee = PANCAKE_FEE if sell_router == "pancakeswap" else BISWAP_FEE
-                
+
                 # Flash loan USDT, trade for WBNB, sell WBNB, repay USDT
-                borrowed_usdt = float(FLASH_LOAN)
-                
+                borrowed_usdt = float(TRADING_CONFIG["borrow_amount"])
+
                 # Step 1: Buy WBNB with borrowed USDT
                 wbnb_bought = (borrowed_usdt / buy_price) * (1 - buy_fee)
-                
+
                 # Step 2: Sell WBNB for USDT
                 wbnb_after_sell_fee = wbnb_bought * (1 - sell_fee)
                 usdt_received = wbnb_after_sell_fee * sell_price
-                
+
                 # Step 3: Calculate DODO repayment (with fee if any)
                 flash_loan_fee_pct = TRADING_CONFIG.get("flash_loan_fee", 0.0)
                 dodo_repay = borrowed_usdt * (1 + flash_loan_fee_pct)
-                
+
                 # Step 4: Calculate profits
                 gross_profit = float(usdt_received - dodo_repay)
                 net_profit = float(gross_profit - GAS_COST)
-                
+
                 # Calculate spread
                 spread = ((sell_price - buy_price) / buy_price) * 100
-                
-                # Store all paths
+
+                # Store all paths (net profit stays a plain USDT float;
+                # formatting happens only at display time)
                 path_key = f"{buy_router}_to_{sell_router}"
                 all_spreads[path_key] = spread
-                all_profits[path_key] = self.w3.to_wei(net_profit, 'ether') if net_profit >= 0 else -self.w3.to_wei(abs(net_profit), 'ether')
-                
+                all_profits[path_key] = net_profit
+
                 # Track best opportunity
                 if abs(spread) > TRADING_CONFIG["min_spread_pct"]:
                     if best_opportunity is None or abs(spread) > abs(best_opportunity.get("spread", 0)):
-                        borrow_wei = self.w3.to_wei(FLASH_LOAN, 'ether')
-                        wbnb_wei = self.w3.to_wei(wbnb_bought, 'ether')
-                        usdt_return_wei = self.w3.to_wei(usdt_received, 'ether')
-                        
-                        if gross_profit >= 0:
-                            gross_profit_wei = self.w3.to_wei(gross_profit, 'ether')
-                        else:
-                            gross_profit_wei = -self.w3.to_wei(abs(gross_profit), 'ether')
-                        
-                        if net_profit >= 0:
-                            net_profit_wei = self.w3.to_wei(net_profit, 'ether')
-                        else:
-                            net_profit_wei = -self.w3.to_wei(abs(net_profit), 'ether')
-                        
-                        best_opportunity = {
-                            "buy_router": buy_router,
-                            "sell_router": sell_router,
-                            "buy_router_addr": self.config["v2_routers"][buy_router],
-                            "sell_router_addr": self.config["v2_routers"][sell_router],
-                            "borrow_amount": borrow_wei,
-                            "intermediate_amount": wbnb_wei,
-                            "final_amount": usdt_return_wei,
-                            "spread": spread,
-                            "estimated_gross_profit": gross_profit_wei,
-                            "estimated_net_profit": net_profit_wei,
-                            "buy_price": buy_price,
-                            "sell_price": sell_price,
-                        }
-        
-        return {
-            "prices": wbnb_prices,
-            "spreads": all_spreads,
-            "profits": all_profits,
-            "opportunity": best_opportunity
-        }
-    
-    def execute_arbitrage_v2(self, opportunity: Dict) -> Optional[str]:
+                        best_opportunity = self._build_opportunity(
+                            buy_router, sell_router, spread,
+                            buy_price, sell_price, wbnb_bought,
+                            usdt_received, gross_profit, net_profit,
+                        )
+
+        return all_spreads, all_profits, best_opportunity
+
+    def _simulate_directions_vectorized(self, router_names: list, prices_f: Dict[str, float]):
+        """Evaluate every (buy, sell) direction with one NumPy broadcast
+        instead of the nested Python loop. Wei-scale integers would overflow
+        int64, so the matrix stays in float64 USDT units - the same numbers
+        the scalar path produces"""
+        names = [name for name in router_names if name in prices_f]
+        if len(names) < 2:
+            return {}, {}, None
+
+        borrowed = float(TRADING_CONFIG["borrow_amount"])
+        gas_cost = TRADING_CONFIG.get("gas_cost_usd", 0.08)
+        repay = borrowed * (1 + TRADING_CONFIG.get("flash_loan_fee", 0.0))
+
+        prices = np.array([prices_f[name] for name in names])
+        fees = np.array([(10000 - self._router_map[name].fee_bps) / 10000.0 for name in names])
+
+        if NUMBA_AVAILABLE:
+            # JIT kernel: matrices plus best direction in one native pass
+            spreads, net, wbnb_bought, i, j = _simulate_all_pairs(
+                prices, fees, borrowed, repay, gas_cost
+            )
+            i, j = int(i), int(j)
+        else:
+            # Leg 1 per buy router, leg 2 broadcast across sell routers
+            wbnb_bought = (borrowed / prices) * (1.0 - fees)
+            usdt_received = wbnb_bought[:, None] * (1.0 - fees)[None, :] * prices[None, :]
+            net = usdt_received - repay - gas_cost
+            spreads = (prices[None, :] - prices[:, None]) / prices[:, None] * 100.0
+
+            abs_spreads = np.abs(spreads)
+            np.fill_diagonal(abs_spreads, -1.0)
+            i, j = np.unravel_index(int(abs_spreads.argmax()), abs_spreads.shape)
+
+        all_spreads = {}
+        all_profits = {}
+        for bi, buy_router in enumerate(names):
+            for bj, sell_router in enumerate(names):
+                if bi != bj:
+                    path_key = f"{buy_router}_to_{sell_router}"
+                    all_spreads[path_key] = float(spreads[bi, bj])
+                    all_profits[path_key] = float(net[bi, bj])
+
+        best_opportunity = None
+        if abs(float(spreads[i, j])) > TRADING_CONFIG["min_spread_pct"]:
+            usdt_ij = float(net[i, j]) + repay + gas_cost
+            best_opportunity = self._build_opportunity(
+                names[i], names[j], float(spreads[i, j]),
+                float(prices[i]), float(prices[j]), float(wbnb_bought[i]),
+                usdt_ij, usdt_ij - repay,
+                float(net[i, j]),
+            )
+
+        return all_spreads, all_profits, best_opportunity
+
+    @functools.lru_cache(maxsize=64)
+    def _encode_v2(self, token, amount, is_base, buy_router, sell_router,
+                   path_buy, path_sell, min_profit) -> str:
+        """ABI-encode executeArbitrageV2 calldata, memoized per argument
+        tuple - for a given route the calldata never changes, only the
+        nonce and gas price do"""
+        return self.arbitrage_contract.encodeABI(
+            fn_name="executeArbitrageV2",
+            args=[token, amount, is_base, buy_router, sell_router,
+                  list(path_buy), list(path_sell), min_profit],
+        )
+
+    async def execute_arbitrage_v2(self, opportunity: Dict) -> Optional[str]:
         """
         Execute arbitrage via smart contract executeArbitrageV2
         Flash loan USDT → Swap on DEXes → Repay loan → Keep profit
         """
         if self.dry_run:
+            # Dry-run fast path: pure logging, zero RPCs and no signer work
             log("🔶 DRY RUN - Would execute arbitrage:", Colors.YELLOW)
-            log(f"  Borrow: {self.w3.from_wei(opportunity['borrow_amount'], 'ether')} USDT", Colors.YELLOW)
+            log(f"  Borrow: {opportunity['borrow_amount'] / 1e18} USDT", Colors.YELLOW)
             log(f"  Buy on: {opportunity['buy_router']} @ ${opportunity['buy_price']:.6f}", Colors.YELLOW)
             log(f"  Sell on: {opportunity['sell_router']} @ ${opportunity['sell_price']:.6f}", Colors.YELLOW)
             log(f"  Spread: {opportunity['spread']:.4f}%", Colors.YELLOW)
-            
-            net_profit_value = opportunity['estimated_net_profit']
-            if net_profit_value >= 0:
-                net_profit_display = self.w3.from_wei(net_profit_value, 'ether')
-            else:
-                net_profit_display = -self.w3.from_wei(abs(net_profit_value), 'ether')
-            log(f"  Expected Net Profit: ${net_profit_display:.4f} USDT", Colors.YELLOW)
-            
+            log(f"  Expected Net Profit: ${opportunity['estimated_net_profit'] / 1e18:.4f} USDT", Colors.YELLOW)
+
             return "DRY_RUN"
         
         try:
-            # Get token addresses
-            token_usdt = self.tokens["USDT"]  # Borrow token
-            token_wbnb = self.tokens["WBNB"]  # Trade token
-            
-            # Build paths
-            path_buy = [token_usdt, token_wbnb]   # USDT → WBNB
-            path_sell = [token_wbnb, token_usdt]  # WBNB → USDT
+            # Checksummed paths were built once at init and travel on the
+            # opportunity dict
+            token_usdt = self.tokens_cs["USDT"]           # Borrow token
+            path_buy = opportunity["path_buy_cs"]         # USDT → WBNB
+            path_sell = opportunity["path_sell_cs"]       # WBNB → USDT
             
-            # Min profit in wei
-            min_profit = self.w3.to_wei(TRADING_CONFIG["min_profit"], "ether")
+            # Min profit in wei, converted once at init
+            min_profit = self._min_profit_wei
             
             log("📝 Building transaction...", Colors.BLUE)
             log(f"   Flash loan: {self.w3.from_wei(opportunity['borrow_amount'], 'ether')} USDT", Colors.CYAN)
             log(f"   Buy on {opportunity['buy_router']}, Sell on {opportunity['sell_router']}", Colors.CYAN)
             
-            # Build transaction for executeArbitrageV2
-            tx = self.arbitrage_contract.functions.executeArbitrageV2(
-                Web3.to_checksum_address(token_usdt),                      # borrowedToken (USDT)
-                opportunity["borrow_amount"],                               # borrowAmount (USDT wei)
-                False,                                                       # isBase (USDT is base token in DODO pool)
-                Web3.to_checksum_address(opportunity["buy_router_addr"]),  # buyRouter
-                Web3.to_checksum_address(opportunity["sell_router_addr"]), # sellRouter
-                [Web3.to_checksum_address(t) for t in path_buy],           # pathBuy (USDT → WBNB)
-                [Web3.to_checksum_address(t) for t in path_sell],          # pathSell (WBNB → USDT)
-                min_profit,                                                 # minProfit
-            ).build_transaction({
+            gas_price = await self.get_gas_price()
+            nonce = await self._next_nonce()
+
+            # Assemble the transaction directly from cached calldata -
+            # build_transaction would re-encode the ABI and round-trip to
+            # the node for metadata on every attempt
+            data = self._encode_v2(
+                token_usdt,                          # borrowedToken (USDT)
+                opportunity["borrow_amount"],        # borrowAmount (USDT wei)
+                False,                               # isBase (USDT is base token in DODO pool)
+                opportunity["buy_router_addr"],      # buyRouter
+                opportunity["sell_router_addr"],     # sellRouter
+                path_buy,                            # pathBuy (USDT → WBNB)
+                path_sell,                           # pathSell (WBNB → USDT)
+                min_profit,                          # minProfit
+            )
+            # Gas limit: estimate once per route with a 10% margin, then
+            # serve from cache - repeat executions skip the extra RPC, and
+            # the fixed 400k budget stays as the fallback if estimation
+            # fails (e.g. the dry estimate reverts on a stale opportunity)
+            gas_key = (opportunity["buy_router"], opportunity["sell_router"])
+            gas_limit = self._gas_cache.get(gas_key)
+            if gas_limit is None:
+                try:
+                    est = await self.w3.eth.estimate_gas({
+                        "from": self.address,
+                        "to": self.arbitrage_contract.address,
+                        "data": data,
+                    })
+                    gas_limit = int(est * 1.1)
+                    log(f"   Gas estimate: {est} (+10% → {gas_limit})", Colors.CYAN)
+                except Exception as e:
+                    gas_limit = 400000
+                    log(f"   Gas estimation failed ({str(e)[:40]}), using {gas_limit}", Colors.YELLOW)
+                self._gas_cache[gas_key] = gas_limit
+
+            tx = {
                 "from": self.address,
-                "gas": 400000,
-                "gasPrice": self.w3.eth.gas_price,
-                "nonce": self.w3.eth.get_transaction_count(self.address, 'pending'),
-            })
+                "to": self.arbitrage_contract.address,
+                "data": data,
+                "gas": gas_limit,
+                "gasPrice": gas_price,
+                "nonce": nonce,
+                "chainId": self._chain_id,
+            }
             
             log("✍️  Signing transaction...", Colors.BLUE)
-            signed = self.w3.eth.account.sign_transaction(tx, self.private_key)
+            # Sign with the LocalAccount built at init - re-deriving the key
+            # from the raw hex on every send is wasted work
+            signed = self.account.sign_transaction(tx)
             
             log("📤 Sending transaction...", Colors.BLUE)
-            tx_hash = self.w3.eth.send_raw_transaction(signed.raw_transaction)
-            
+            tx_hash = await self.w3.eth.send_raw_transaction(signed.raw_transaction)
+            self._nonce += 1
+
             log(f"📨 TX Hash: {tx_hash.hex()}", Colors.GREEN)
-            
-            # Wait for confirmation
-            log("⏳ Waiting for confirmation...", Colors.BLUE)
-            receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=120)
-            
+
+            # Confirm in the background - blocking here for up to 120s would
+            # blind the bot to fresh opportunities while the trade settles
+            log("⏳ Awaiting confirmation in background...", Colors.BLUE)
+            self._pending[tx_hash] = asyncio.create_task(self._await_receipt(tx_hash, tx))
+
+            return tx_hash.hex()
+
+        except Exception as e:
+            if "nonce" in str(e).lower():
+                # Out of sync with the chain - resync on the next attempt
+                self._nonce = None
+            log(f"❌ Execution error: {str(e)}", Colors.RED)
+            import traceback
+            traceback.print_exc()
+            return None
+
+    async def _await_receipt(self, tx_hash, tx: Dict):
+        """Background receipt wait - the scan loop keeps running while the
+        trade confirms, and the outcome is logged when the receipt lands"""
+        try:
+            # BSC blocks land every ~3s; web3's default 0.1s poll just burns
+            # RPC quota, so slow the receipt poll to one request per second
+            # (or the configured pacing gap if it's wider)
+            receipt = await self.w3.eth.wait_for_transaction_receipt(
+                tx_hash, timeout=120, poll_latency=max(1.0, self._rpc_min_gap)
+            )
+
             if receipt["status"] == 1:
                 gas_used = receipt["gasUsed"]
-                gas_price = tx["gasPrice"]
-                gas_cost = self.w3.from_wei(gas_used * gas_price, "ether")
-                
+                gas_cost = self.w3.from_wei(gas_used * tx["gasPrice"], "ether")
+
                 log(f"✅ ARBITRAGE SUCCESSFUL!", Colors.GREEN)
                 log(f"   Gas used: {gas_used} ({gas_cost:.6f} BNB)", Colors.CYAN)
-                
+
                 if receipt["logs"]:
                     log(f"   Event logs: {len(receipt['logs'])} events emitted", Colors.CYAN)
-                
-                return tx_hash.hex()
             else:
                 log(f"❌ Transaction REVERTED", Colors.RED)
-                
+
                 # Try to get revert reason
                 try:
-                    self.w3.eth.call(tx, receipt["blockNumber"])
+                    await self.w3.eth.call(tx, receipt["blockNumber"])
                 except Exception as e:
                     error_msg = str(e)
-                    
+
                     if "InsufficientProfit" in error_msg:
                         log(f"   Revert Reason: InsufficientProfit", Colors.YELLOW)
                         log(f"   → Actual profit was below minProfit threshold", Colors.YELLOW)
@@ -427,17 +1190,16 @@ class ArbitrageBot:
                             log(f"   Revert Reason: {error_msg}", Colors.YELLOW)
                     else:
                         log(f"   Revert Reason: {error_msg}", Colors.YELLOW)
-                
-                return None
-                
+
         except Exception as e:
-            log(f"❌ Execution error: {str(e)}", Colors.RED)
-            import traceback
-            traceback.print_exc()
-            return None
-    
-    def run(self, interval: float = 10.0):
+            log(f"⏳ No receipt for {tx_hash.hex()}: {str(e)[:60]}", Colors.YELLOW)
+        finally:
+            self._pending.pop(tx_hash, None)
+
+    async def run(self, interval: float = 10.0):
         """Main bot loop - scan for opportunities and execute"""
+        await self.connect()
+
         print(f"\n{Colors.CYAN}{Colors.BOLD}{'=' * 80}")
         print("FLASH LOAN ARBITRAGE BOT - BSC MAINNET")
         print("Real money, real trades!")
@@ -459,9 +1221,10 @@ class ArbitrageBot:
         print(f"  Database:          {'Enabled ✓' if self.db else 'Disabled'}")
         print(f"  DEX Routers:       {list(self.routers.keys())}")
         
-        bnb_balance = self.get_balance()
-        usdt_balance = self.get_token_balance("USDT")
-        wbnb_balance = self.get_token_balance("WBNB")
+        bnb_balance = await self.get_balance()
+        token_balances = await self.get_token_balances(["USDT", "WBNB"])
+        usdt_balance = token_balances.get("USDT", 0.0)
+        wbnb_balance = token_balances.get("WBNB", 0.0)
         
         print(f"\n{Colors.BOLD}Balances:{Colors.END}")
         print(f"  BNB:   {bnb_balance:.4f}")
@@ -473,19 +1236,36 @@ class ArbitrageBot:
             print(f"{Colors.YELLOW}Flash loan arbitrage will execute on BSC mainnet!{Colors.END}\n")
         
         log("🚀 Starting arbitrage bot...", Colors.GREEN)
-        
+
+        # Event-driven rescans: wake on pool Sync events when a websocket
+        # endpoint is reachable, otherwise fall back to fixed-rate polling
+        ws = await self.subscribe_sync_events()
+
         iteration = 0
         opportunities_found = 0
         executions_attempted = 0
         executions_successful = 0
-        
+
+        # (spread, net_profit) per scan, aggregated at shutdown - cheaper
+        # than asking Postgres to re-scan the session's rows
+        scan_stats = []
+
+        # Target time for the next polling-mode scan: sleeping toward a
+        # fixed tick keeps the cadence at `interval` instead of
+        # scan_time + interval drifting with RPC latency
+        next_tick = time.perf_counter()
+
+        # Hot-loop locals: attribute and config-dict lookups hoisted out
+        # of the per-scan path
+        db = self.db
+        borrow_amount = float(TRADING_CONFIG["borrow_amount"])
+
         try:
             while True:
                 iteration += 1
-                timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
-                
+
                 # Find opportunity
-                result = self.find_arbitrage_opportunity()
+                result = await self.find_arbitrage_opportunity()
                 
                 prices = result.get("prices", {})
                 spreads = result.get("spreads", {})
@@ -494,7 +1274,7 @@ class ArbitrageBot:
                 
                 # Log to database
                 scan_id = None
-                if self.db and len(prices) >= 2:
+                if db and len(prices) >= 2:
                     price_list = list(prices.values())
                     overall_spread = abs(price_list[0] - price_list[1]) / min(price_list) * 100
                     
@@ -502,110 +1282,191 @@ class ArbitrageBot:
                     if opp:
                         net_profit_value = opp.get('estimated_net_profit', 0)
                         best_net_profit = float(net_profit_value) / 1e18 if net_profit_value >= 0 else -float(abs(net_profit_value)) / 1e18
-                    
-                    scan_id = self.db.log_price_scan(
-                        pancake_price=float(price_list[0]),
-                        biswap_price=float(price_list[1]) if len(price_list) > 1 else 0,
-                        spread=overall_spread,
-                        price_changed=True,
-                        best_gross_profit=best_net_profit,
-                    )
+
+                    if opp:
+                        # Write through for opportunity scans - the scan_id
+                        # is needed as a foreign key right away
+                        scan_id = db.log_price_scan(
+                            pancake_price=float(price_list[0]),
+                            biswap_price=float(price_list[1]) if len(price_list) > 1 else 0,
+                            spread=overall_spread,
+                            price_changed=True,
+                            best_gross_profit=best_net_profit,
+                        )
+                    else:
+                        # Routine scans go to the background writer
+                        self._queue_scan((
+                            datetime.now(),
+                            float(price_list[0]),
+                            float(price_list[1]) if len(price_list) > 1 else 0,
+                            overall_spread,
+                            True,
+                            best_net_profit,
+                        ))
                 
-                # Display
+                # Display (timestamp formatted only when there is something
+                # to show)
                 if len(prices) >= 2:
-                    print(f"\n{Colors.BOLD}[{timestamp}] Scan #{iteration}{Colors.END}")
-                    
+                    timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
+                    lines = [f"\n{Colors.BOLD}[{timestamp}] Scan #{iteration}{Colors.END}\n"]
+
                     for router_name, price in sorted(prices.items()):
-                        print(f"  {router_name.capitalize()}: ${price:.6f} USDT/WBNB")
-                    
+                        lines.append(f"  {router_name.capitalize()}: ${price:.6f} USDT/WBNB\n")
+
                     price_list = list(prices.values())
                     if len(price_list) >= 2:
                         overall_spread = abs(price_list[0] - price_list[1]) / min(price_list) * 100
-                        print(f"  Spread:      {overall_spread:.4f}%")
-                    
+                        lines.append(f"  Spread:      {overall_spread:.4f}%\n")
+                        # Raw floats buffered for the shutdown aggregates -
+                        # appending a tuple costs nothing per scan
+                        scan_stats.append((
+                            overall_spread,
+                            opp['estimated_net_profit'] / 1e18 if opp else 0.0,
+                        ))
+
                     if scan_id:
-                        print(f"  DB Scan ID: {scan_id}")
-                    
+                        lines.append(f"  DB Scan ID: {scan_id}\n")
+
                     if spreads:
-                        print(f"\n  {Colors.CYAN}Spreads:{Colors.END}")
+                        lines.append(f"\n  {Colors.CYAN}Spreads:{Colors.END}\n")
                         for path, spread_val in spreads.items():
                             color = Colors.GREEN if abs(spread_val) > 0.5 else Colors.YELLOW
-                            print(f"    {path}: {color}{spread_val:.4f}%{Colors.END}")
-                    
+                            lines.append(f"    {path}: {color}{spread_val:.4f}%{Colors.END}\n")
+
                     if profits:
-                        print(f"\n  {Colors.CYAN}Estimated Net Profits:{Colors.END}")
-                        for path, profit_wei in profits.items():
-                            profit_val = self.w3.from_wei(abs(profit_wei), 'ether') if profit_wei >= 0 else -self.w3.from_wei(abs(profit_wei), 'ether')
+                        lines.append(f"\n  {Colors.CYAN}Estimated Net Profits:{Colors.END}\n")
+                        for path, profit_val in profits.items():
                             color = Colors.GREEN if profit_val > 0 else Colors.RED
-                            print(f"    {path}: {color}${profit_val:.4f} USDT{Colors.END}")
-                    
+                            lines.append(f"    {path}: {color}${profit_val:.4f} USDT{Colors.END}\n")
+
                     if opp:
                         opportunities_found += 1
-                        net_profit_value = opp['estimated_net_profit']
-                        if net_profit_value >= 0:
-                            net_profit_display = self.w3.from_wei(net_profit_value, 'ether')
-                        else:
-                            net_profit_display = -self.w3.from_wei(abs(net_profit_value), 'ether')
-                        
-                        print(f"\n{Colors.GREEN}{Colors.BOLD}🔥 OPPORTUNITY #{opportunities_found}!{Colors.END}")
-                        print(f"  Strategy: Buy {opp['buy_router'].capitalize()} → Sell {opp['sell_router'].capitalize()}")
-                        print(f"  Net Profit: {Colors.GREEN}${net_profit_display:.4f} USDT{Colors.END}")
-                        
+                        # Plain float division instead of from_wei - no
+                        # Decimal construction, and it handles negatives
+                        # without the sign dance
+                        net_profit_display = opp['estimated_net_profit'] / 1e18
+
+
+                        lines.append(f"\n{Colors.GREEN}{Colors.BOLD}🔥 OPPORTUNITY #{opportunities_found}!{Colors.END}\n")
+                        lines.append(f"  Strategy: Buy {opp['buy_router'].capitalize()} → Sell {opp['sell_router'].capitalize()}\n")
+                        lines.append(f"  Net Profit: {Colors.GREEN}${net_profit_display:.4f} USDT{Colors.END}\n")
+                        # Flush before the execution path so ordering against
+                        # direct log() calls stays sane
+                        self._logq.put_nowait("".join(lines))
+                        lines = []
+
                         # Log opportunity to database
-                        if self.db and scan_id:
+                        if db and scan_id:
                             db_opp = {
                                 "buy_dex": opp["buy_router"],
                                 "sell_dex": opp["sell_router"],
                                 "buy_price": float(opp["buy_price"]),
                                 "sell_price": float(opp["sell_price"]),
                                 "net": net_profit_display,
-                                "flash_loan_amount": float(TRADING_CONFIG["borrow_amount"]),
+                                "flash_loan_amount": borrow_amount,
                             }
-                            self.db.log_arbitrage_opportunity(scan_id, db_opp)
-                        
-                        # Execute
-                        log("⚡ Executing arbitrage...", Colors.BOLD)
-                        executions_attempted += 1
+                            db.log_arbitrage_opportunity(scan_id, db_opp)
                         
-                        tx_hash = self.execute_arbitrage_v2(opp)
-                        
-                        if tx_hash and tx_hash != "DRY_RUN":
-                            executions_successful += 1
-                            explorer_url = f"{NETWORKS['bsc_mainnet']['explorer']}/tx/{tx_hash}"
-                            print(f"{Colors.GREEN}🔗 {explorer_url}{Colors.END}\n")
+                        # Execute only above the configured profit floor -
+                        # the contract enforces minProfit on-chain anyway, so
+                        # a below-threshold send would just revert and burn
+                        # gas (plus the nonce/signing work getting there)
+                        if opp['estimated_net_profit'] >= self._min_profit_wei:
+                            log("⚡ Executing arbitrage...", Colors.BOLD)
+                            executions_attempted += 1
+
+                            tx_hash = await self.execute_arbitrage_v2(opp)
+
+                            if tx_hash and tx_hash != "DRY_RUN":
+                                executions_successful += 1
+                                explorer_url = f"{NETWORKS['bsc_mainnet']['explorer']}/tx/{tx_hash}"
+                                print(f"{Colors.GREEN}🔗 {explorer_url}{Colors.END}\n")
+                        else:
+                            log(f"⏭️  Below min profit threshold "
+                                f"(${self._min_profit_wei / 1e18:.4f} USDT) - not executing",
+                                Colors.YELLOW)
                     else:
-                        print(f"  {Colors.YELLOW}No opportunity{Colors.END}")
+                        lines.append(f"  {Colors.YELLOW}No opportunity{Colors.END}\n")
+
+                    if lines:
+                        self._logq.put_nowait("".join(lines))
                 else:
-                    print(f"[{timestamp}] Scan #{iteration} - Failed to fetch prices", end='\r')
+                    self._logq.put_nowait(f"[{_hms()}] Scan #{iteration} - Failed to fetch prices\r")
                 
-                time.sleep(interval)
-                
-        except KeyboardInterrupt:
-            print(f"\n\n{Colors.YELLOW}Bot stopped by user{Colors.END}")
-            print(f"\n{Colors.CYAN}{'=' * 80}{Colors.END}")
-            print(f"{Colors.BOLD}📊 SESSION SUMMARY:{Colors.END}")
-            print(f"{Colors.CYAN}{'=' * 80}{Colors.END}")
-            print(f"  Total Scans:           {iteration}")
-            print(f"  Opportunities Found:   {opportunities_found}")
-            print(f"  Executions Attempted:  {executions_attempted}")
-            print(f"  Executions Successful: {executions_successful}")
+                if ws:
+                    try:
+                        await self.wait_for_sync(ws, timeout=max(interval * 6, 60.0))
+                    except asyncio.TimeoutError:
+                        pass  # no pool movement for a while - rescan anyway
+                    except Exception:
+                        ws = None  # socket died - fall back to polling
+                        next_tick = time.perf_counter()  # resync the ticker
+                        await asyncio.sleep(interval)
+                else:
+                    next_tick += interval
+                    delay = next_tick - time.perf_counter()
+                    if delay <= 0:
+                        # Scan overran the interval - resync instead of
+                        # racing zero-sleeps to catch up
+                        self._logq.put_nowait(
+                            f"[{_hms()}] ⚠️  Scan overran the {interval}s interval\n")
+                        next_tick = time.perf_counter()
+                        delay = 0.0
+                    await asyncio.sleep(delay)
+
+        except (KeyboardInterrupt, asyncio.CancelledError):
+            # Under asyncio.run, Ctrl+C cancels this task rather than
+            # raising KeyboardInterrupt at the await point - catch both so
+            # the summary and DB flush run either way.
+            # Build the whole summary and write it in one go - no reason to
+            # pay a syscall per line on the way out
+            summary = [
+                f"\n\n{Colors.YELLOW}Bot stopped by user{Colors.END}",
+                f"\n{Colors.CYAN}{_DIV}{Colors.END}",
+                f"{Colors.BOLD}📊 SESSION SUMMARY:{Colors.END}",
+                f"{Colors.CYAN}{_DIV}{Colors.END}",
+                f"  Total Scans:           {iteration}",
+                f"  Opportunities Found:   {opportunities_found}",
+                f"  Quote Cache Hits:      {self._quote_cache_hits}",
+                f"  Executions Attempted:  {executions_attempted}",
+                f"  Executions Successful: {executions_successful}",
+            ]
             if executions_attempted > 0:
                 success_rate = (executions_successful / executions_attempted) * 100
-                print(f"  Success Rate:          {success_rate:.1f}%")
-            print(f"{Colors.CYAN}{'=' * 80}{Colors.END}\n")
+                summary.append(f"  Success Rate:          {success_rate:.1f}%")
+            if scan_stats:
+                # Session aggregates from the in-process buffer - one C-level
+                # reduction pass when numpy is around, plain builtins if not
+                if NUMPY_AVAILABLE:
+                    arr = np.asarray(scan_stats, dtype=np.float64)
+                    avg_spread, max_spread, min_spread = \
+                        arr[:, 0].mean(), arr[:, 0].max(), arr[:, 0].min()
+                    max_net = arr[:, 1].max()
+                else:
+                    spreads_col = [s for s, _ in scan_stats]
+                    avg_spread = sum(spreads_col) / len(spreads_col)
+                    max_spread, min_spread = max(spreads_col), min(spreads_col)
+                    max_net = max(n for _, n in scan_stats)
+                summary.append(f"  Avg Spread:            {avg_spread:.4f}%")
+                summary.append(f"  Max/Min Spread:        {max_spread:.4f}% / {min_spread:.4f}%")
+                summary.append(f"  Best Net Profit Seen:  ${max_net:.4f} USDT")
+            summary.append(f"{Colors.CYAN}{_DIV}{Colors.END}\n")
+            sys.stdout.write("\n".join(summary) + "\n")
+            sys.stdout.flush()
             
-            # End database session
+            # End database session (flush queued scans first)
             if self.db and self.session_id:
+                self._flush_db_queue()
                 self.db.end_session(self.session_id, iteration, opportunities_found)
                 self.db.close()
             
             log("Goodbye! 👋", Colors.YELLOW)
 
 def main():
-    print(f"\n{Colors.CYAN}{Colors.BOLD}{'=' * 80}")
+    print(f"\n{Colors.CYAN}{Colors.BOLD}{_DIV}")
     print("FLASH LOAN ARBITRAGE BOT - BSC MAINNET")
     print("Live Smart Contract Execution")
-    print(f"{'=' * 80}{Colors.END}\n")
+    print(f"{_DIV}{Colors.END}\n")
     
     if not WEB3_AVAILABLE:
         print(f"{Colors.RED}Error: Web3.py is required{Colors.END}")
@@ -622,7 +1483,9 @@ def main():
     
     try:
         bot = ArbitrageBot(private_key, dry_run)
-        bot.run(interval=10)
+        asyncio.run(bot.run(interval=10))
+    except KeyboardInterrupt:
+        pass  # shutdown summary already printed inside run()
     except Exception as e:
         log(f"Fatal error: {e}", Colors.RED)
         import traceback
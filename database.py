@@ -4,7 +4,7 @@ Handles PostgreSQL connection and logging of all price scans
 """
 import psycopg2
 from psycopg2 import pool
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import RealDictCursor, execute_values
 from datetime import datetime
 from typing import Optional, Dict
 import os
@@ -225,6 +225,36 @@ class ArbitrageDatabase:
             cursor.close()
             self.connection_pool.putconn(conn)
     
+    def log_price_scans_batch(self, scans) -> bool:
+        """
+        Insert a batch of buffered price scans in a single round-trip
+        Each scan is (timestamp, pancake_price, biswap_price, spread, price_changed)
+        """
+        if not self.connected or not scans:
+            return False
+
+        conn = self.connection_pool.getconn()
+
+        try:
+            cursor = conn.cursor()
+            execute_values(cursor, """
+                INSERT INTO price_scans
+                (scan_timestamp, pancakeswap_price, biswap_price, spread_percentage, price_changed)
+                VALUES %s;
+            """, scans, page_size=100)
+
+            conn.commit()
+            return True
+
+        except psycopg2.Error as e:
+            print(f"✗ Error logging scan batch: {e}")
+            conn.rollback()
+            return False
+
+        finally:
+            cursor.close()
+            self.connection_pool.putconn(conn)
+
     def log_arbitrage_opportunity(self, scan_id: int, opportunity: Dict) -> bool:
         """Log an arbitrage opportunity to the database"""
         if not self.connected:
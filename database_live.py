@@ -5,7 +5,7 @@ WITH GROSS PROFIT TRACKING
 """
 import psycopg2
 from psycopg2 import pool
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import RealDictCursor, execute_values
 from datetime import datetime
 from typing import Optional, Dict
 import os
@@ -109,10 +109,17 @@ class ArbitrageDatabase:
                 );
             """)
             
-            # Create indexes for better query performance
+            # Create indexes for better query performance.
+            # price_scans is append-only with naturally ordered timestamps,
+            # so a BRIN index covers the time-range queries at a tiny
+            # fraction of a btree's size and write overhead.
             cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_price_scans_timestamp 
-                ON price_scans(scan_timestamp);
+                DROP INDEX IF EXISTS idx_price_scans_timestamp;
+            """)
+
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_price_scans_timestamp_brin
+                ON price_scans USING BRIN (scan_timestamp);
             """)
             
             cursor.execute("""
@@ -261,6 +268,38 @@ class ArbitrageDatabase:
             cursor.close()
             self.connection_pool.putconn(conn)
     
+    def log_price_scans_batch(self, scans) -> bool:
+        """
+        Insert many price scans in a single round-trip
+        Each scan is a tuple of (timestamp, pancake_price, biswap_price,
+        spread, price_changed, best_gross_profit)
+        """
+        if not self.connected or not scans:
+            return False
+
+        conn = self.connection_pool.getconn()
+
+        try:
+            cursor = conn.cursor()
+            execute_values(cursor, """
+                INSERT INTO price_scans
+                (scan_timestamp, pancakeswap_price, biswap_price, spread_percentage,
+                 price_changed, best_gross_profit)
+                VALUES %s;
+            """, scans, page_size=100)
+
+            conn.commit()
+            return True
+
+        except psycopg2.Error as e:
+            print(f"✗ Error logging price scan batch: {e}")
+            conn.rollback()
+            return False
+
+        finally:
+            cursor.close()
+            self.connection_pool.putconn(conn)
+
     def log_arbitrage_opportunity(self, scan_id: int, opportunity: Dict) -> bool:
         """Log an arbitrage opportunity to the database"""
         if not self.connected: